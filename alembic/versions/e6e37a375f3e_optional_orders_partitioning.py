@@ -0,0 +1,166 @@
+"""optional orders partitioning
+
+Only runs when requested explicitly:
+
+    alembic -x partition_orders=true upgrade head
+
+Databases upgraded without the flag can be converted later with
+``python -m project.commands.partitions --convert``.
+
+The conversion below is a frozen copy of what that command did when this
+revision was written, so later changes to the command (new indexes, for
+instance) do not change what this revision does; later revisions add
+their own objects on top.
+
+Revision ID: e6e37a375f3e
+Revises: 36b9b6ed0f00
+Create Date: 2026-10-19 04:09:53.421359
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import context, op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6e37a375f3e'
+down_revision: Union[str, None] = '36b9b6ed0f00'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+INDEXED_COLUMNS = (
+    'created_at',
+    'deleted_at',
+    'is_deleted',
+    'is_updated',
+    'updated_at',
+)
+
+
+def _enabled() -> bool:
+    x_args = context.get_x_argument(as_dictionary=True)
+    return x_args.get('partition_orders', '').lower() in ('1', 'true', 'yes')
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(conn) -> bool:
+    return conn.scalar(
+        text(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid '
+            "WHERE c.relname = 'orders')"
+        )
+    )
+
+
+def _create_indexes():
+    for column in INDEXED_COLUMNS:
+        op.execute(f'CREATE INDEX ix_orders_{column} ON orders ({column})')
+
+
+def _drop_indexes():
+    for column in INDEXED_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_orders_{column}')
+
+
+def _convert(conn):
+    op.execute(
+        'ALTER TABLE orders_products '
+        'DROP CONSTRAINT IF EXISTS orders_products_order_id_fkey'
+    )
+    _drop_indexes()
+    op.execute('ALTER TABLE orders RENAME TO orders_legacy')
+    op.execute(
+        'ALTER TABLE orders_legacy '
+        'RENAME CONSTRAINT orders_pkey TO orders_legacy_pkey'
+    )
+    op.execute(
+        'CREATE TABLE orders (LIKE orders_legacy INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (created_at)'
+    )
+    op.execute('ALTER TABLE orders ADD PRIMARY KEY (id, created_at)')
+    op.execute(
+        'ALTER TABLE orders ADD CONSTRAINT orders_client_id_fkey '
+        'FOREIGN KEY (client_id) REFERENCES clients (id)'
+    )
+    op.execute('ALTER SEQUENCE orders_id_seq OWNED BY orders.id')
+
+    oldest = conn.scalar(text('SELECT min(created_at) FROM orders_legacy'))
+    month = _month_start(oldest or datetime.now())
+    last = _add_months(_month_start(date.today()), MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f'CREATE TABLE IF NOT EXISTS orders_p{month.year:04d}_'
+            f'{month.month:02d} PARTITION OF orders '
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    op.execute('CREATE TABLE orders_default PARTITION OF orders DEFAULT')
+
+    op.execute('INSERT INTO orders SELECT * FROM orders_legacy')
+    op.execute('DROP TABLE orders_legacy')
+    _create_indexes()
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_orders_products_order_id '
+        'ON orders_products (order_id)'
+    )
+
+
+def _revert():
+    _drop_indexes()
+    op.execute(
+        'CREATE TABLE orders_plain '
+        '(LIKE orders INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    op.execute('INSERT INTO orders_plain SELECT * FROM orders')
+    op.execute('ALTER SEQUENCE orders_id_seq OWNED BY orders_plain.id')
+    op.execute('DROP TABLE orders')
+    op.execute('ALTER TABLE orders_plain RENAME TO orders')
+    op.execute(
+        'ALTER TABLE orders ADD CONSTRAINT orders_pkey PRIMARY KEY (id)'
+    )
+    op.execute(
+        'ALTER TABLE orders ADD CONSTRAINT orders_client_id_fkey '
+        'FOREIGN KEY (client_id) REFERENCES clients (id)'
+    )
+    _create_indexes()
+    op.execute('DROP INDEX IF EXISTS ix_orders_products_order_id')
+    op.execute(
+        'ALTER TABLE orders_products '
+        'ADD CONSTRAINT orders_products_order_id_fkey '
+        'FOREIGN KEY (order_id) REFERENCES orders (id)'
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _enabled():
+        return
+    if context.is_offline_mode():
+        raise RuntimeError(
+            'partition_orders needs a database connection (the partitions '
+            'depend on the existing rows); run it without --sql'
+        )
+
+    conn = op.get_bind()
+    if not _is_partitioned(conn):
+        _convert(conn)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Offline scripts assume the default, unpartitioned layout.
+    if not context.is_offline_mode() and _is_partitioned(op.get_bind()):
+        _revert()
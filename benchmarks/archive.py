@@ -0,0 +1,151 @@
+"""Index size and listing latency before/after archiving soft-deleted rows.
+
+Run against a disposable database, it inserts and removes rows:
+
+    DB_URL=... python -m benchmarks.archive --rows 200000 --deleted 0.6
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from project.commands.archive import archive_soft_deleted
+from project.config import settings
+from project.models.base import Base, Client, Role, User, configure_models
+
+INDEX_SIZES = text(
+    """
+    SELECT indexrelname AS name, pg_relation_size(indexrelid) AS bytes
+    FROM pg_stat_user_indexes
+    WHERE relname = 'clients'
+    ORDER BY indexrelname
+    """
+)
+
+
+async def seed(session: AsyncSession, rows: int, deleted: float):
+    chunk = 5000
+    for start in range(0, rows, chunk):
+        await session.execute(
+            insert(Client.__table__),
+            [
+                {
+                    'name': f'client{index}',
+                    'email': f'client{index}@bench.com',
+                    'cpf': f'{index:011d}',
+                    'password': 'hash',
+                    'role': Role.CLIENT,
+                }
+                for index in range(start, min(start + chunk, rows))
+            ],
+        )
+    await session.execute(
+        update(Client.__table__)
+        .where(Client.id <= int(rows * deleted))
+        .values(
+            is_deleted=True,
+            deleted_at=datetime.now() - timedelta(days=365),
+        )
+    )
+    await session.commit()
+
+
+async def measure(session: AsyncSession, samples: int) -> dict:
+    sizes = {row.name: row.bytes for row in await session.execute(INDEX_SIZES)}
+    query = (
+        select(User)
+        .where(User.is_deleted == False)  # noqa
+        .offset(1000)
+        .limit(100)
+    )
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        (await session.scalars(query)).all()
+        timings.append((time.perf_counter() - started) * 1000)
+        session.expunge_all()
+
+    return {
+        'index_bytes': sizes,
+        'index_bytes_total': sum(sizes.values()),
+        'listing_ms_p50': round(statistics.median(timings), 3),
+        'listing_ms_p95': round(statistics.quantiles(timings, n=20)[-1], 3),
+    }
+
+
+async def maintenance(engine, reindex: bool):
+    autocommit = engine.execution_options(isolation_level='AUTOCOMMIT')
+    async with autocommit.connect() as conn:
+        await conn.execute(text('VACUUM ANALYZE clients'))
+        if reindex:
+            await conn.execute(text('REINDEX TABLE clients'))
+
+
+async def main(args: argparse.Namespace):
+    configure_models()
+    engine = create_async_engine(settings.DB_URL)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed(session, args.rows, args.deleted)
+        await maintenance(engine, reindex=False)
+        before = await measure(session, args.samples)
+
+        report = await archive_soft_deleted(
+            session,
+            'clients',
+            older_than_days=30,
+            mode=args.mode,
+            batch_size=args.batch_size,
+            throttle=0,
+        )
+        await maintenance(engine, reindex=args.reindex)
+        after = await measure(session, args.samples)
+
+    await engine.dispose()
+
+    print(
+        json.dumps(
+            {
+                'rows': args.rows,
+                'deleted_fraction': args.deleted,
+                'mode': args.mode,
+                'archived_rows': report.rows,
+                'archive_seconds': report.elapsed_seconds,
+                'before': before,
+                'after': after,
+            },
+            indent=2,
+        )
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--deleted', type=float, default=0.5)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument(
+        '--mode', choices=('archive', 'purge'), default='archive'
+    )
+    parser.add_argument(
+        '--reindex',
+        action='store_true',
+        help='REINDEX after archiving so freed index pages are returned',
+    )
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
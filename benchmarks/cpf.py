@@ -0,0 +1,65 @@
+"""CPF validation throughput: validate_docbr versus project.utils.cpf.
+
+    python -m benchmarks.cpf --size 100000 --repeat 5
+
+The validate_docbr case builds a CPF() per value, like the schema used to.
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from validate_docbr import CPF
+
+from project.utils import cpf
+
+
+def sample(size: int, invalid: float, masked: float) -> list[str]:
+    generator = CPF()
+    values = []
+    for _ in range(size):
+        value = generator.generate(mask=random.random() < masked)
+        if random.random() < invalid:
+            value = value[:-1] + str((int(value[-1]) + 1) % 10)
+        values.append(value)
+
+    return values
+
+
+def main(args: argparse.Namespace):
+    values = sample(args.size, args.invalid, args.masked)
+    cases = {
+        'validate_docbr': lambda: [CPF().validate(v) for v in values],
+        'validate_docbr_shared': lambda: list(map(CPF().validate, values)),
+        'normalize': lambda: [cpf.normalize(v) for v in values],
+        'normalize_many': lambda: cpf.normalize_many(values),
+    }
+
+    results = {}
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        results[name] = {
+            'seconds': round(best, 4),
+            'per_value_us': round(best / args.size * 1e6, 3),
+        }
+
+    baseline = results['validate_docbr']['seconds']
+    for result in results.values():
+        result['speedup'] = round(baseline / result['seconds'], 2)
+
+    print(json.dumps({'size': args.size, 'results': results}, indent=2))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--invalid', type=float, default=0.1)
+    parser.add_argument('--masked', type=float, default=0.5)
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    main(parse_args())
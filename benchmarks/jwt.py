@@ -0,0 +1,95 @@
+"""JWT sign/verify throughput per algorithm, preloaded keys versus raw.
+
+    python -m benchmarks.jwt --number 200
+
+`raw` passes the secret or PEM to PyJWT on every call, as security.py used
+to; `keyring` uses the key objects project.keys parses once.
+"""
+
+import argparse
+import json
+import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from jwt import decode, encode
+
+from project.keys import KeyRing, hmac_key, pem_key
+
+PAYLOAD = {'sub': 'bench@example.com', 'exp': 4_102_444_800}
+
+
+def _pem(private_key) -> tuple[bytes, bytes]:
+    private = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+    return private, public
+
+
+def cases() -> dict[str, tuple]:
+    secret = 'x' * 64
+    rsa_pem = _pem(
+        rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    )
+    ec_pem = _pem(ec.generate_private_key(ec.SECP256R1()))
+    ed_pem = _pem(ed25519.Ed25519PrivateKey.generate())
+
+    return {
+        'HS256': (secret, secret, hmac_key(secret, 'HS256')),
+        'RS256': (*rsa_pem, pem_key(rsa_pem[0], 'rsa')),
+        'ES256': (*ec_pem, pem_key(ec_pem[0], 'ec')),
+        'EdDSA': (*ed_pem, pem_key(ed_pem[0], 'ed')),
+    }
+
+
+def _rate(fn, number: int, repeat: int) -> float:
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return round(number / best, 1)
+
+
+def main(args: argparse.Namespace):
+    results = {}
+    for algorithm, (signing, verifying, key) in cases().items():
+        keyring = KeyRing([key], key.kid)
+        raw_token = encode(PAYLOAD, signing, algorithm=algorithm)
+        token = keyring.sign(PAYLOAD)
+
+        results[algorithm] = {
+            'raw_sign_per_s': _rate(
+                lambda: encode(PAYLOAD, signing, algorithm=algorithm),
+                args.number,
+                args.repeat,
+            ),
+            'keyring_sign_per_s': _rate(
+                lambda: keyring.sign(PAYLOAD), args.number, args.repeat
+            ),
+            'raw_verify_per_s': _rate(
+                lambda: decode(raw_token, verifying, algorithms=[algorithm]),
+                args.number,
+                args.repeat,
+            ),
+            'keyring_verify_per_s': _rate(
+                lambda: keyring.verify(token), args.number, args.repeat
+            ),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    main(parse_args())
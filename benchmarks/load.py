@@ -0,0 +1,444 @@
+"""Fixed-concurrency load test for the main API flows.
+
+Seed a disposable database and run every scenario in-process:
+
+    DB_URL=... python -m benchmarks.load run --reset --clients 5000 \\
+        --concurrency 32 --requests 500 --output results.json
+
+Point --url at a running server to drive it over HTTP instead (the
+database behind it is still seeded through DB_URL). Compare two runs:
+
+    python -m benchmarks.load compare base.json results.json --threshold 0.1
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import math
+import platform
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from httpx import ASGITransport, AsyncClient, Response
+from validate_docbr import CPF
+
+from project.database import SessionLocal, get_engine
+from project.main import app
+from project.models.base import Base, Role, Section, configure_models
+from project.security import get_password_hash
+
+PASSWORD = 'benchmark'
+
+
+def _load_conftest():
+    # validate-docbr installs a top-level `tests` package that shadows ours,
+    # so `import tests.conftest` is not reliable; load it by path instead.
+    path = Path(__file__).resolve().parents[1] / 'tests' / 'conftest.py'
+    spec = importlib.util.spec_from_file_location('_bench_conftest', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+conftest = _load_conftest()
+UserFactory = conftest.UserFactory
+AdminFactory = conftest.AdminFactory
+ProductFactory = conftest.ProductFactory
+
+SECTIONS = list(Section)
+# Products per PATCH /products/stock request. Concurrent requests get
+# disjoint windows of products, so batches never wait on each other.
+STOCK_BATCH = 50
+
+
+@dataclass
+class Context:
+    client_emails: list[str]
+    client_token: str
+    admin_token: str
+    counter: itertools.count
+    product_ids: list[int]
+    # Unspent refresh tokens, one per in-flight request; each rotation
+    # puts its replacement back.
+    refresh_tokens: deque[str]
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    request: Callable[[AsyncClient, Context, int], Awaitable[Response]]
+    ok: tuple[int, ...] = (HTTPStatus.OK,)
+
+
+def _auth(token: str) -> dict:
+    return {'Authorization': f'Bearer {token}'}
+
+
+async def _token(client: AsyncClient, ctx: Context, index: int):
+    email = ctx.client_emails[index % len(ctx.client_emails)]
+    return await client.post(
+        '/auth/token', data={'username': email, 'password': PASSWORD}
+    )
+
+
+async def _refresh(client: AsyncClient, ctx: Context, index: int):
+    response = await client.post(
+        '/auth/refresh_token',
+        json={'refresh_token': ctx.refresh_tokens.popleft()},
+    )
+    if response.status_code == HTTPStatus.OK:
+        ctx.refresh_tokens.append(response.json()['refresh_token'])
+
+    return response
+
+
+async def _signup(client: AsyncClient, ctx: Context, index: int):
+    number = next(ctx.counter)
+    return await client.post(
+        '/client/',
+        json={
+            'name': f'signup{number}',
+            'email': f'signup{number}-{time.time_ns()}@bench.com',
+            'cpf': CPF().generate(),
+            'password': PASSWORD,
+        },
+    )
+
+
+async def _list_users(client: AsyncClient, ctx: Context, index: int):
+    return await client.get(
+        '/admin/',
+        params={'offset': (index * 100) % 1000, 'limit': 100},
+        headers=_auth(ctx.admin_token),
+    )
+
+
+async def _list_products(client: AsyncClient, ctx: Context, index: int):
+    return await client.get(
+        '/products/',
+        params={
+            'section': SECTIONS[index % len(SECTIONS)].value,
+            'offset': (index * 100) % 1000,
+            'limit': 100,
+        },
+    )
+
+
+async def _get_product(client: AsyncClient, ctx: Context, index: int):
+    product_id = ctx.product_ids[index % len(ctx.product_ids)]
+    return await client.get(f'/products/{product_id}')
+
+
+async def _create_order(client: AsyncClient, ctx: Context, index: int):
+    ids = ctx.product_ids
+    return await client.post(
+        '/orders/',
+        json={
+            'items': [
+                {'product_id': ids[index % len(ids)], 'quantity': 1},
+                {'product_id': ids[(index * 7 + 1) % len(ids)], 'quantity': 2},
+            ]
+        },
+        headers=_auth(ctx.client_token),
+    )
+
+
+async def _stock_batch(client: AsyncClient, ctx: Context, index: int):
+    windows = max(len(ctx.product_ids) // STOCK_BATCH, 1)
+    start = (index % windows) * STOCK_BATCH
+    return await client.patch(
+        '/products/stock',
+        json={
+            'items': [
+                {'id': product_id, 'delta': 1}
+                for product_id in ctx.product_ids[start : start + STOCK_BATCH]
+            ]
+        },
+        headers=_auth(ctx.admin_token),
+    )
+
+
+SCENARIOS = [
+    Scenario('token', 'POST', '/auth/token', _token),
+    Scenario('refresh_token', 'POST', '/auth/refresh_token', _refresh),
+    Scenario('signup', 'POST', '/client/', _signup, (HTTPStatus.CREATED,)),
+    Scenario('list_users', 'GET', '/admin/', _list_users),
+    Scenario('list_products', 'GET', '/products/', _list_products),
+    Scenario('get_product', 'GET', '/products/{product_id}', _get_product),
+    Scenario(
+        'create_order',
+        'POST',
+        '/orders/',
+        _create_order,
+        (HTTPStatus.CREATED,),
+    ),
+    Scenario('stock_batch', 'PATCH', '/products/stock', _stock_batch),
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+async def seed(
+    clients: int, admins: int, products: int, reset: bool
+) -> tuple[list[str], list[str], list[int]]:
+    if reset:
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    # One Argon2 hash shared by every seeded user keeps seeding fast.
+    hashed = get_password_hash(PASSWORD)
+    stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    users = [
+        UserFactory(
+            name=f'bench{stamp}c{index}',
+            cpf=CPF().generate(),
+            password=hashed,
+            role=Role.CLIENT,
+        )
+        for index in range(max(clients, 1))
+    ]
+    admins = [
+        AdminFactory(
+            name=f'bench{stamp}a{index}',
+            cpf=CPF().generate(),
+            password=hashed,
+            role=Role.ADMIN,
+        )
+        for index in range(max(admins, 1))
+    ]
+    # Enough stock that order scenarios never run out.
+    products = [
+        ProductFactory(
+            name=f'bench{stamp}p{index}',
+            barcode=f'{index:012d}',
+            section=SECTIONS[index % len(SECTIONS)],
+            stock=10_000_000,
+        )
+        for index in range(max(products, 1))
+    ]
+
+    async with SessionLocal() as session:
+        session.add_all(users + admins + products)
+        await session.commit()
+
+    return (
+        [user.email for user in users],
+        [admin.email for admin in admins],
+        [product.id for product in products],
+    )
+
+
+async def login(client: AsyncClient, email: str) -> dict:
+    response = await client.post(
+        '/auth/token', data={'username': email, 'password': PASSWORD}
+    )
+    response.raise_for_status()
+
+    return response.json()
+
+
+async def available_paths(client: AsyncClient) -> set[tuple[str, str]]:
+    schema = (await client.get(app.openapi_url)).json()
+
+    return {
+        (method.upper(), path)
+        for path, operations in schema['paths'].items()
+        for method in operations
+    }
+
+
+async def run_scenario(
+    client: AsyncClient,
+    ctx: Context,
+    scenario: Scenario,
+    concurrency: int,
+    total: int,
+) -> dict:
+    latencies = []
+    errors = 0
+    issued = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (index := next(issued)) < total:
+            started = time.perf_counter()
+            try:
+                response = await scenario.request(client, ctx, index)
+                failed = response.status_code not in scenario.ok
+            except Exception:  # noqa: BLE001
+                failed = True
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    return {
+        'requests': total,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(total / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    # SQL echo would both skew timings and pollute the JSON on stdout.
+    get_engine().echo = False
+    # ASGITransport does not run the app lifespan.
+    configure_models()
+    emails, admin_emails, product_ids = await seed(
+        args.clients, args.admins, args.products, args.reset
+    )
+
+    if args.url:
+        client = AsyncClient(base_url=args.url, timeout=60)
+    else:
+        client = AsyncClient(
+            transport=ASGITransport(app=app), base_url='http://bench'
+        )
+
+    async with client:
+        paths = await available_paths(client)
+        client_login = await login(client, emails[0])
+        ctx = Context(
+            client_emails=emails,
+            client_token=client_login['access_token'],
+            admin_token=(await login(client, admin_emails[0]))['access_token'],
+            counter=itertools.count(),
+            product_ids=product_ids,
+            refresh_tokens=deque([client_login['refresh_token']]),
+        )
+        for _ in range(args.concurrency - 1):
+            extra = await login(client, emails[0])
+            ctx.refresh_tokens.append(extra['refresh_token'])
+        results = {}
+        for scenario in SCENARIOS:
+            if args.scenarios and scenario.name not in args.scenarios:
+                continue
+            if (scenario.method, scenario.path) not in paths:
+                continue
+            results[scenario.name] = await run_scenario(
+                client, ctx, scenario, args.concurrency, args.requests
+            )
+
+    return {
+        'meta': {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'target': args.url or 'in-process',
+            'python': platform.python_version(),
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'seeded_clients': args.clients,
+            'seeded_admins': args.admins,
+            'seeded_products': args.products,
+        },
+        'scenarios': results,
+    }
+
+
+def compare(base: dict, current: dict, threshold: float) -> list[dict]:
+    """Flag scenarios whose latency grew or throughput fell by > threshold."""
+    regressions = []
+    for name, new in current['scenarios'].items():
+        old = base['scenarios'].get(name)
+        if old is None:
+            continue
+        for metric, worse_when_higher in (
+            ('p50_ms', True),
+            ('p95_ms', True),
+            ('p99_ms', True),
+            ('throughput_rps', False),
+        ):
+            if not old[metric]:
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            if not worse_when_higher:
+                change = -change
+            if change > threshold:
+                regressions.append({
+                    'scenario': name,
+                    'metric': metric,
+                    'base': old[metric],
+                    'current': new[metric],
+                    'change': round(change, 4),
+                })
+
+    return regressions
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('--url')
+    run_parser.add_argument('--reset', action='store_true')
+    run_parser.add_argument('--clients', type=int, default=1000)
+    run_parser.add_argument('--admins', type=int, default=10)
+    run_parser.add_argument('--products', type=int, default=1000)
+    run_parser.add_argument('--concurrency', type=int, default=16)
+    run_parser.add_argument('--requests', type=int, default=200)
+    run_parser.add_argument(
+        '--scenarios', nargs='*', choices=[s.name for s in SCENARIOS]
+    )
+    run_parser.add_argument('--output')
+
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.command == 'compare':
+        with open(args.base, encoding='utf-8') as base_file:
+            base = json.load(base_file)
+        with open(args.current, encoding='utf-8') as current_file:
+            current = json.load(current_file)
+        regressions = compare(base, current, args.threshold)
+        print(json.dumps({'regressions': regressions}, indent=2))
+        return 1 if regressions else 0
+
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output)
+    print(output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Query plans of the admin user-listing filters (GET /admin/).
+
+Run against a disposable database migrated with `alembic upgrade head`,
+so the trigram indexes exist when pg_trgm is available; it replaces the
+rows of `clients` and `admins`:
+
+    DB_URL=... python -m benchmarks.user_filters --clients 200000
+
+docs/user-filters.md is this script's output.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from project.config import settings
+from project.models.base import Admin, Client, Role, configure_models
+from project.routers.users import users_query
+from project.schemas.users import UserFilterPage
+
+FIRST_NAMES = ('ana', 'bruno', 'carla', 'diego', 'elisa', 'fabio', 'gabi')
+
+CASES = {
+    'no filter': {},
+    'email, exact': {'email': 'diego17@bench.com'},
+    'name, prefix': {'name': 'Carla16', 'match': 'prefix'},
+    'email, prefix': {'email': 'elisa102', 'match': 'prefix'},
+    'email, contains': {'email': 'o1234', 'match': 'contains'},
+    'name, contains': {'name': 'la777', 'match': 'contains'},
+    'cpf, prefix': {'cpf': '000.001.2', 'match': 'prefix'},
+    'created range': {
+        'created_from': '2025-02-01T00:00:00',
+        'created_to': '2025-02-02T00:00:00',
+    },
+    'role': {'role': 'admin'},
+    'role + name, prefix': {
+        'role': 'client',
+        'name': 'ana1',
+        'match': 'prefix',
+    },
+    'role + created range': {
+        'role': 'client',
+        'created_from': '2025-02-01T00:00:00',
+        'created_to': '2025-02-02T00:00:00',
+    },
+}
+
+
+def _rows(count: int, role: Role, offset: int = 0) -> list[dict]:
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            'name': f'{FIRST_NAMES[index % len(FIRST_NAMES)]}{index}',
+            'email': f'{FIRST_NAMES[index % len(FIRST_NAMES)]}{index}'
+            '@bench.com',
+            'cpf': f'{offset + index:011d}',
+            'password': 'hash',
+            'role': role,
+            'created_at': start + timedelta(minutes=index),
+        }
+        for index in range(count)
+    ]
+
+
+async def seed(session: AsyncSession, clients: int, admins: int):
+    await session.execute(text('TRUNCATE clients, admins CASCADE'))
+    chunk = 5000
+    rows = _rows(clients, Role.CLIENT)
+    for start in range(0, clients, chunk):
+        await session.execute(
+            insert(Client.__table__), rows[start : start + chunk]
+        )
+    await session.execute(
+        insert(Admin.__table__), _rows(admins, Role.ADMIN, clients)
+    )
+    await session.commit()
+
+
+async def explain(session: AsyncSession, filters: dict) -> str:
+    query = users_query(UserFilterPage(**filters))
+    conn = await session.connection()
+    compiled = query.compile(conn.sync_connection)
+    plan = await conn.exec_driver_sql(
+        'EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF, SUMMARY OFF) '
+        + compiled.string,
+        compiled.params,
+    )
+
+    return '\n'.join(row[0] for row in plan)
+
+
+async def main(args: argparse.Namespace):
+    configure_models()
+    engine = create_async_engine(settings.DB_URL)
+
+    async with AsyncSession(engine) as session:
+        await seed(session, args.clients, args.admins)
+        autocommit = engine.execution_options(isolation_level='AUTOCOMMIT')
+        async with autocommit.connect() as conn:
+            await conn.execute(text('VACUUM ANALYZE clients, admins'))
+
+        for name, filters in CASES.items():
+            print(f'### {name}\n\n`{filters}`\n\n```')
+            print(await explain(session, filters))
+            print('```\n')
+
+    await engine.dispose()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=200_000)
+    parser.add_argument('--admins', type=int, default=200)
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import Table, and_, delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.config import settings
+from project.database import SessionLocal, get_engine
+from project.models.base import (
+    Admin,
+    Base,
+    Client,
+    Product,
+    admins_archive_table,
+    clients_archive_table,
+    products_archive_table,
+)
+
+ARCHIVE_TABLES = {
+    Client.__table__.name: (Client.__table__, clients_archive_table),
+    Admin.__table__.name: (Admin.__table__, admins_archive_table),
+    Product.__table__.name: (Product.__table__, products_archive_table),
+}
+
+MODES = ('archive', 'purge')
+
+
+@dataclass
+class ArchiveReport:
+    table: str
+    mode: str
+    dry_run: bool
+    cutoff: str
+    batches: int = 0
+    rows: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def _referenced_by(table: Table):
+    """Yield NOT EXISTS clauses for every foreign key pointing at `table`.
+
+    Rows still referenced (a client with orders, a product in an order)
+    are left alone, otherwise the hard delete would violate the FK.
+    """
+    for other in Base.metadata.sorted_tables:
+        for fk in other.foreign_keys:
+            if fk.column.table is table:
+                yield ~exists().where(fk.parent == fk.column)
+
+
+def _candidates(table: Table, cutoff: datetime, last_id: int, limit: int):
+    return (
+        select(table.c.id)
+        .where(
+            and_(
+                table.c.is_deleted == True,  # noqa
+                table.c.deleted_at < cutoff,
+                table.c.id > last_id,
+                *_referenced_by(table),
+            )
+        )
+        .order_by(table.c.id)
+        .limit(limit)
+    )
+
+
+def _move_batch(table: Table, archive: Table, batch):
+    moved = (
+        delete(table)
+        .where(table.c.id.in_(select(batch.c.id)))
+        .returning(*table.c)
+        .cte('moved')
+    )
+    columns = [column.name for column in table.c]
+
+    return (
+        insert(archive)
+        .from_select(columns, select(*(moved.c[name] for name in columns)))
+        .returning(archive.c.id)
+    )
+
+
+def _purge_batch(table: Table, batch):
+    return (
+        delete(table)
+        .where(table.c.id.in_(select(batch.c.id)))
+        .returning(table.c.id)
+    )
+
+
+async def archive_soft_deleted(  # noqa: PLR0913, PLR0917
+    session: AsyncSession,
+    table_name: str,
+    older_than_days: int = settings.ARCHIVE_RETENTION_DAYS,
+    mode: str = 'archive',
+    batch_size: int = settings.ARCHIVE_BATCH_SIZE,
+    throttle: float = settings.ARCHIVE_THROTTLE_SECONDS,
+    dry_run: bool = False,
+) -> ArchiveReport:
+    if mode not in MODES:
+        raise ValueError(f'Invalid mode: {mode}')
+
+    table, archive = ARCHIVE_TABLES[table_name]
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    report = ArchiveReport(
+        table=table_name, mode=mode, dry_run=dry_run, cutoff=str(cutoff)
+    )
+    started = time.perf_counter()
+    last_id = 0
+
+    while True:
+        batch = _candidates(table, cutoff, last_id, batch_size)
+
+        if dry_run:
+            stmt = batch
+        else:
+            batch = batch.with_for_update(skip_locked=True).cte('batch')
+            if mode == 'archive':
+                stmt = _move_batch(table, archive, batch)
+            else:
+                stmt = _purge_batch(table, batch)
+
+        ids = (await session.scalars(stmt)).all()
+        await session.commit()
+
+        if not ids:
+            break
+
+        report.batches += 1
+        report.rows += len(ids)
+        last_id = max(ids)
+
+        if len(ids) < batch_size:
+            break
+
+        if throttle:
+            await asyncio.sleep(throttle)
+
+    report.elapsed_seconds = round(time.perf_counter() - started, 3)
+
+    return report
+
+
+async def main(args: argparse.Namespace):
+    get_engine()
+    async with SessionLocal() as session:
+        for table_name in args.tables:
+            report = await archive_soft_deleted(
+                session,
+                table_name,
+                older_than_days=args.older_than_days,
+                mode=args.mode,
+                batch_size=args.batch_size,
+                throttle=args.throttle,
+                dry_run=args.dry_run,
+            )
+            print(json.dumps(asdict(report)))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Archive or purge rows soft-deleted long ago.'
+    )
+    parser.add_argument(
+        '--tables',
+        nargs='+',
+        choices=list(ARCHIVE_TABLES),
+        default=list(ARCHIVE_TABLES),
+    )
+    parser.add_argument('--mode', choices=MODES, default='archive')
+    parser.add_argument(
+        '--older-than-days',
+        type=int,
+        default=settings.ARCHIVE_RETENTION_DAYS,
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE
+    )
+    parser.add_argument(
+        '--throttle',
+        type=float,
+        default=settings.ARCHIVE_THROTTLE_SECONDS,
+        help='seconds to sleep between batches',
+    )
+    parser.add_argument('--dry-run', action='store_true')
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
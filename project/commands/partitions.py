@@ -0,0 +1,293 @@
+import argparse
+import asyncio
+import json
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from project.database import get_engine
+
+PARENT = 'orders'
+PARTITION_NAME = re.compile(r'^orders_p(\d{4})_(\d{2})$')
+INDEXED_COLUMNS = (
+    'created_at',
+    'deleted_at',
+    'is_deleted',
+    'is_updated',
+    'updated_at',
+)
+PARTIAL_INDEXES = {
+    'ix_orders_pending': "(created_at, id) WHERE status = 'PENDING'",
+}
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'{PARENT}_p{month.year:04d}_{month.month:02d}'
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return conn.scalar(
+        text(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p '
+            'JOIN pg_class c ON c.oid = p.partrelid '
+            'WHERE c.relname = :name)'
+        ),
+        {'name': PARENT},
+    )
+
+
+def list_partitions(conn: Connection) -> list[str]:
+    return list(
+        conn.scalars(
+            text(
+                'SELECT c.relname FROM pg_inherits i '
+                'JOIN pg_class c ON c.oid = i.inhrelid '
+                'JOIN pg_class p ON p.oid = i.inhparent '
+                'WHERE p.relname = :name ORDER BY c.relname'
+            ),
+            {'name': PARENT},
+        )
+    )
+
+
+def create_partition(conn: Connection, month: date):
+    conn.execute(
+        text(
+            f'CREATE TABLE IF NOT EXISTS {partition_name(month)} '
+            f'PARTITION OF {PARENT} '
+            f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+        )
+    )
+
+
+def ensure_partitions(
+    conn: Connection,
+    months_ahead: int = 3,
+    today: date | None = None,
+    dry_run: bool = False,
+) -> list[str]:
+    current = month_start(today or date.today())
+    existing = set(list_partitions(conn))
+    created = []
+
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if partition_name(month) in existing:
+            continue
+        if not dry_run:
+            create_partition(conn, month)
+        created.append(partition_name(month))
+
+    return created
+
+
+def detach_partitions(
+    conn: Connection,
+    retain_months: int = 12,
+    today: date | None = None,
+    dry_run: bool = False,
+) -> list[str]:
+    """Detach monthly partitions entirely older than the retention window.
+
+    Detached partitions become plain tables, so their rows can still be
+    archived or dropped separately without touching the live table.
+    """
+    oldest_kept = add_months(
+        month_start(today or date.today()), -retain_months
+    )
+    detached = []
+
+    for name in list_partitions(conn):
+        match = PARTITION_NAME.match(name)
+        if not match:
+            continue
+        month = date(int(match[1]), int(match[2]), 1)
+        if month >= oldest_kept:
+            continue
+        if not dry_run:
+            conn.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION {name}'))
+        detached.append(name)
+
+    return detached
+
+
+def _create_indexes(conn: Connection):
+    for column in INDEXED_COLUMNS:
+        conn.execute(
+            text(f'CREATE INDEX ix_orders_{column} ON {PARENT} ({column})')
+        )
+    for name, definition in PARTIAL_INDEXES.items():
+        conn.execute(text(f'CREATE INDEX {name} ON {PARENT} {definition}'))
+
+
+def _drop_indexes(conn: Connection):
+    for column in INDEXED_COLUMNS:
+        conn.execute(text(f'DROP INDEX IF EXISTS ix_orders_{column}'))
+    for name in PARTIAL_INDEXES:
+        conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+
+
+def convert_orders(conn: Connection, months_ahead: int = 3):
+    """Turn `orders` into a table range-partitioned by month on created_at.
+
+    Postgres requires the partition key in every unique constraint, so the
+    primary key becomes (id, created_at) and orders_products can no longer
+    keep a foreign key to orders.id; it gets a plain index instead.
+    """
+    if is_partitioned(conn):
+        return
+
+    conn.execute(
+        text(
+            'ALTER TABLE orders_products '
+            'DROP CONSTRAINT IF EXISTS orders_products_order_id_fkey'
+        )
+    )
+    _drop_indexes(conn)
+    conn.execute(text(f'ALTER TABLE {PARENT} RENAME TO orders_legacy'))
+    conn.execute(
+        text(
+            'ALTER TABLE orders_legacy '
+            'RENAME CONSTRAINT orders_pkey TO orders_legacy_pkey'
+        )
+    )
+    conn.execute(
+        text(
+            f'CREATE TABLE {PARENT} (LIKE orders_legacy INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (created_at)'
+        )
+    )
+    conn.execute(
+        text(f'ALTER TABLE {PARENT} ADD PRIMARY KEY (id, created_at)')
+    )
+    conn.execute(
+        text(
+            f'ALTER TABLE {PARENT} ADD CONSTRAINT orders_client_id_fkey '
+            'FOREIGN KEY (client_id) REFERENCES clients (id)'
+        )
+    )
+    conn.execute(text(f'ALTER SEQUENCE orders_id_seq OWNED BY {PARENT}.id'))
+
+    oldest = conn.scalar(text('SELECT min(created_at) FROM orders_legacy'))
+    month = month_start(oldest or datetime.now())
+    last = add_months(month_start(date.today()), months_ahead)
+    while month <= last:
+        create_partition(conn, month)
+        month = add_months(month, 1)
+    conn.execute(
+        text(f'CREATE TABLE {PARENT}_default PARTITION OF {PARENT} DEFAULT')
+    )
+
+    conn.execute(text(f'INSERT INTO {PARENT} SELECT * FROM orders_legacy'))
+    conn.execute(text('DROP TABLE orders_legacy'))
+    _create_indexes(conn)
+    conn.execute(
+        text(
+            'CREATE INDEX IF NOT EXISTS ix_orders_products_order_id '
+            'ON orders_products (order_id)'
+        )
+    )
+
+
+def revert_orders(conn: Connection):
+    """Fold attached partitions back into a plain `orders` table.
+
+    Partitions detached by the maintenance command are not copied back.
+    """
+    if not is_partitioned(conn):
+        return
+
+    _drop_indexes(conn)
+    conn.execute(
+        text(
+            'CREATE TABLE orders_plain '
+            f'(LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+    )
+    conn.execute(text(f'INSERT INTO orders_plain SELECT * FROM {PARENT}'))
+    conn.execute(text('ALTER SEQUENCE orders_id_seq OWNED BY orders_plain.id'))
+    conn.execute(text(f'DROP TABLE {PARENT}'))
+    conn.execute(text(f'ALTER TABLE orders_plain RENAME TO {PARENT}'))
+    conn.execute(
+        text(
+            f'ALTER TABLE {PARENT} ADD CONSTRAINT orders_pkey PRIMARY KEY (id)'
+        )
+    )
+    conn.execute(
+        text(
+            f'ALTER TABLE {PARENT} ADD CONSTRAINT orders_client_id_fkey '
+            'FOREIGN KEY (client_id) REFERENCES clients (id)'
+        )
+    )
+    _create_indexes(conn)
+    conn.execute(text('DROP INDEX IF EXISTS ix_orders_products_order_id'))
+    conn.execute(
+        text(
+            'ALTER TABLE orders_products '
+            'ADD CONSTRAINT orders_products_order_id_fkey '
+            f'FOREIGN KEY (order_id) REFERENCES {PARENT} (id)'
+        )
+    )
+
+
+async def main(args: argparse.Namespace):
+    async with get_engine().begin() as conn:
+        if args.convert and not args.dry_run:
+            await conn.run_sync(convert_orders, args.ahead)
+
+        if not await conn.run_sync(is_partitioned):
+            raise SystemExit(
+                'orders is not partitioned; run '
+                '`alembic -x partition_orders=true upgrade head` '
+                'or pass --convert'
+            )
+
+        created = await conn.run_sync(
+            ensure_partitions, args.ahead, dry_run=args.dry_run
+        )
+        detached = await conn.run_sync(
+            detach_partitions, args.retain, dry_run=args.dry_run
+        )
+
+    print(
+        json.dumps({
+            'dry_run': args.dry_run,
+            'created': created,
+            'detached': detached,
+        })
+    )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Pre-create future and detach old orders partitions.'
+    )
+    parser.add_argument(
+        '--ahead', type=int, default=3, help='months to pre-create'
+    )
+    parser.add_argument(
+        '--retain', type=int, default=12, help='months to keep attached'
+    )
+    parser.add_argument(
+        '--convert',
+        action='store_true',
+        help='partition orders first if it is still a plain table',
+    )
+    parser.add_argument('--dry-run', action='store_true')
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,121 @@
+"""Report the cold-start cost of the app, module by module.
+
+Imports the app in a fresh interpreter under `-X importtime` and runs its
+lifespan startup (which connects to DB_URL to warm the pool), e.g.:
+
+    python -m project.commands.startup_profile --top 20
+    python -m project.commands.startup_profile --prefix project --sort self
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+
+PROBE = """
+import asyncio, json, time
+
+started = time.perf_counter()
+from project.main import app
+imported = time.perf_counter()
+
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'startup_ms': (ready - imported) * 1000,
+}))
+"""
+
+
+@dataclass
+class ModuleCost:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines) -> list[ModuleCost]:
+    """Parse `-X importtime` output: `import time: self | cumul | name`."""
+    costs = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:') :].split('|')
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        module = name.rstrip()
+        stripped = module.lstrip()
+        costs.append(
+            ModuleCost(
+                module=stripped,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(module) - len(stripped) - 1) // 2,
+            )
+        )
+
+    return costs
+
+
+def profile() -> tuple[dict, list[ModuleCost]]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+
+    return timings, parse_importtime(result.stderr.splitlines())
+
+
+def main(args: argparse.Namespace):
+    timings, costs = profile()
+    if args.prefix:
+        costs = [c for c in costs if c.module.startswith(args.prefix)]
+    costs.sort(key=lambda c: getattr(c, f'{args.sort}_us'), reverse=True)
+    costs = costs[: args.top]
+
+    if args.json:
+        print(
+            json.dumps(
+                {**timings, 'modules': [asdict(c) for c in costs]}, indent=2
+            )
+        )
+        return
+
+    print(f'import:  {timings["import_ms"]:8.1f} ms')
+    print(f'startup: {timings["startup_ms"]:8.1f} ms')
+    print(f'\n{"self ms":>9} {"cumul ms":>9}  module')
+    for cost in costs:
+        print(
+            f'{cost.self_us / 1000:9.1f} {cost.cumulative_us / 1000:9.1f}  '
+            f'{cost.module}'
+        )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Report import and startup time of the app per module.'
+    )
+    parser.add_argument('--top', type=int, default=30)
+    parser.add_argument(
+        '--sort', choices=('self', 'cumulative'), default='cumulative'
+    )
+    parser.add_argument(
+        '--prefix', help='only list modules starting with this prefix'
+    )
+    parser.add_argument('--json', action='store_true')
+
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    main(parse_args())
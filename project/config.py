@@ -10,6 +10,63 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 1.0
+
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None
+    JWKS_MAX_AGE_SECONDS: int = 300
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARMUP: int = 2
+
+    DB_REPLICA_URL: str | None = None
+    DB_REPLICA_STICKINESS_SECONDS: float = 5.0
+
+    ADMISSION_CONTROL_ENABLED: bool = True
+
+    PASSWORD_HASH_WORKERS: int = 4
+
+    HEALTH_DB_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_MAX_POOL_UTILIZATION: float = 0.9
+    HEALTH_MAX_HASH_QUEUE: int = 32
+    HEALTH_MAX_LOOP_LAG_SECONDS: float = 0.25
+
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.1
+    LOOP_DEBUG: bool = False
+
+    IDEMPOTENCY_BACKEND: str = 'memory'
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_MAX_KEYS: int = 10_000
+    IDEMPOTENCY_EVICT_INTERVAL_SECONDS: float = 300.0
+
+    # Cache-Control per route path, overriding project.http_cache's
+    # defaults, e.g. CACHE_CONTROL='{"/products/": "public, max-age=300"}'.
+    CACHE_CONTROL: dict[str, str] = {}
+
+    # 'memory' (per worker) or 'redis' (shared; needs the redis package).
+    RESPONSE_CACHE_BACKEND: str = 'memory'
+    RESPONSE_CACHE_URL: str = 'redis://localhost:6379/0'
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 60
+
+    COUNT_EXACT_THRESHOLD: int = 10_000
+    COUNT_CACHE_TTL_SECONDS: float = 30
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    STOCK_BATCH_CHUNK_SIZE: int = 1000
+
+    ORDER_TTL_MINUTES: int = 30
+    ORDER_REAPER_ENABLED: bool = True
+    ORDER_REAPER_INTERVAL_SECONDS: float = 60.0
+    ORDER_REAPER_BATCH_SIZE: int = 500
+
+    ARCHIVE_RETENTION_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_THROTTLE_SECONDS: float = 0.1
 
 
 settings = Settings()
@@ -0,0 +1,110 @@
+"""Total row counts for paginated listings, exact or estimated.
+
+`exact` runs COUNT(*), which reads every matching row. `estimate` asks the
+planner instead (EXPLAIN, no execution): its row estimate comes from the
+statistics ANALYZE keeps, `pg_class.reltuples` and the column histograms,
+so it is cheap at any size but can be off for selective filters. `auto`
+counts exactly only when the estimate is below COUNT_EXACT_THRESHOLD.
+
+Results are cached per statement and parameters for
+COUNT_CACHE_TTL_SECONDS, so paging through a listing counts once.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.config import settings
+
+
+class CountCache:
+    """Per-process TTL cache; entries expire in insertion order."""
+
+    def __init__(
+        self,
+        ttl: float = settings.COUNT_CACHE_TTL_SECONDS,
+        max_entries: int = settings.COUNT_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, int, bool]] = (
+            OrderedDict()
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def evict_expired(self):
+        # Also makes room for one more entry when the cache is full.
+        now = self.clock()
+        while self._entries:
+            expires_at, _, _ = next(iter(self._entries.values()))
+            if expires_at > now and len(self._entries) < self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    def get(self, key: tuple) -> tuple[int, bool] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            return None
+
+        return entry[1], entry[2]
+
+    def set(self, key: tuple, total: int, exact: bool):
+        self.evict_expired()
+        self._entries[key] = (self.clock() + self.ttl, total, exact)
+        self._entries.move_to_end(key)
+
+
+count_cache = CountCache()
+
+
+def _unpaged(query: Select) -> Select:
+    return query.limit(None).offset(None).order_by(None)
+
+
+async def exact_count(session: AsyncSession, query: Select) -> int:
+    return await session.scalar(
+        select(func.count()).select_from(_unpaged(query).subquery())
+    )
+
+
+async def _estimate(conn, compiled) -> int:
+    result = await conn.exec_driver_sql(
+        'EXPLAIN (FORMAT JSON) ' + compiled.string, compiled.params
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def count(
+    session: AsyncSession, query: Select, mode: str
+) -> tuple[int, bool]:
+    """Total rows `query` would return without paging, and if it is exact."""
+    conn = await session.connection()
+    compiled = _unpaged(query).compile(conn.sync_connection)
+    key = (mode, compiled.string, tuple(sorted(compiled.params.items())))
+
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if mode == 'exact':
+        total, exact = await exact_count(session, query), True
+    else:
+        total, exact = await _estimate(conn, compiled), False
+        if mode == 'auto' and total < settings.COUNT_EXACT_THRESHOLD:
+            total, exact = await exact_count(session, query), True
+
+    count_cache.set(key, total, exact)
+
+    return total, exact
@@ -1,14 +1,104 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import asyncio
+import time
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from project.config import settings
 
-engine = create_async_engine(settings.DB_URL, echo=True)
-SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+# Engines are created on first use (normally by the app lifespan): creating
+# one loads the psycopg dialect, which is the costliest part of importing
+# this module. The session factories are bound at that point.
+SessionLocal = async_sessionmaker(expire_on_commit=False)
+ReplicaSessionLocal = async_sessionmaker(expire_on_commit=False)
+_engines: dict[str, AsyncEngine] = {}
+
+PRIMARY_STICKY_COOKIE = 'db_primary_until'
+
+
+def get_engine() -> AsyncEngine:
+    if 'primary' not in _engines:
+        pool = {
+            'pool_size': settings.DB_POOL_SIZE,
+            'max_overflow': settings.DB_MAX_OVERFLOW,
+        }
+        primary = create_async_engine(settings.DB_URL, echo=True, **pool)
+        replica = primary
+        if settings.DB_REPLICA_URL:
+            replica = create_async_engine(
+                settings.DB_REPLICA_URL, echo=True, **pool
+            )
+        SessionLocal.configure(bind=primary)
+        ReplicaSessionLocal.configure(bind=replica)
+        _engines.update(primary=primary, replica=replica)
+
+    return _engines['primary']
+
+
+async def dispose_engines():
+    for engine in set(_engines.values()):
+        await engine.dispose()
+    _engines.clear()
+
+
+async def warm_up(engine: AsyncEngine, connections: int, statements=()):
+    """Open `connections` pooled connections and run `statements` once.
+
+    The connections are checked out concurrently so that each one is a new
+    connection, and they stay in the pool when returned. Running the
+    statements through an ORM session fills the compiled-statement cache
+    the request handlers would otherwise fill on their first requests.
+    """
+
+    async def checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+
+    await asyncio.gather(*(checkout() for _ in range(connections)))
+
+    async with AsyncSession(engine) as session:
+        for statement in statements:
+            await session.execute(statement)
+
+
+def wants_primary(request: Request) -> bool:
+    """Whether this client wrote recently and must read from the primary.
+
+    The cookie is set by `ReadYourWritesMiddleware` after every successful
+    write, so a client never reads a replica that lags behind its own write.
+    """
+    until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+
+    try:
+        return float(until) > time.time()
+    except (TypeError, ValueError):
+        return False
 
 
 async def get_db():
+    get_engine()
     async with SessionLocal() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db(request: Request):
+    get_engine()
+    if wants_primary(request):
+        session_factory = SessionLocal
+    else:
+        session_factory = ReplicaSessionLocal
+
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,161 @@
+"""Conditional GET for resources that are read far more than written.
+
+Validators come from the rows being returned: a weak ETag hashes every
+row's (id, updated_at or created_at), and Last-Modified is the newest of
+those times. A request whose If-None-Match (or, without it,
+If-Modified-Since) still matches gets a bodyless 304, so unchanged rows
+are never serialized or sent. The rows are still read, which keeps the
+validators exact without invalidation hooks on every write.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any, Callable, Iterable
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from project.config import settings
+
+# Cache-Control per route path; settings.CACHE_CONTROL overrides entries.
+DEFAULT_CACHE_CONTROL = {
+    '/products/': 'public, max-age=60',
+    '/products/{product_id}': 'public, max-age=60',
+    '/client/{user_id}': 'private, no-cache',
+}
+
+
+def cache_control(request: Request) -> str | None:
+    route = request.scope.get('route')
+    if route is None:
+        return None
+    policies = {**DEFAULT_CACHE_CONTROL, **settings.CACHE_CONTROL}
+
+    return policies.get(route.path)
+
+
+def changed_at(row) -> datetime:
+    return row.updated_at or row.created_at
+
+
+def validators(rows: Iterable) -> tuple[str, datetime | None]:
+    digest = hashlib.sha1(usedforsecurity=False)
+    last_modified = None
+    for row in rows:
+        changed = changed_at(row)
+        digest.update(f'{row.id}:{changed.isoformat()};'.encode())
+        if last_modified is None or changed > last_modified:
+            last_modified = changed
+
+    return f'W/"{digest.hexdigest()[:20]}"', last_modified
+
+
+def _http_date(value: datetime) -> str:
+    # Timestamps are stored as naive local time.
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    # Weak comparison: W/"x" and "x" match.
+    return tag.strip().removeprefix('W/')
+
+
+def not_modified(
+    request: Request, etag: str, last_modified: datetime | None
+) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        return _opaque(etag) in {
+            _opaque(tag) for tag in if_none_match.split(',')
+        }
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    # HTTP dates have one-second resolution.
+    return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= (
+        since
+    )
+
+
+@dataclass(frozen=True)
+class RenderedResponse:
+    """A serialized JSON body with its validators, ready to cache."""
+
+    body: bytes
+    etag: str
+    last_modified: datetime | None
+
+    def dumps(self) -> bytes:
+        header = {
+            'etag': self.etag,
+            'last_modified': self.last_modified
+            and self.last_modified.isoformat(),
+        }
+        return json.dumps(header).encode() + b'\n' + self.body
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'RenderedResponse':
+        header, body = data.split(b'\n', 1)
+        header = json.loads(header)
+        last_modified = header['last_modified']
+        return cls(
+            body,
+            header['etag'],
+            last_modified and datetime.fromisoformat(last_modified),
+        )
+
+
+def _headers(
+    request: Request, etag: str, last_modified: datetime | None
+) -> dict:
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = _http_date(last_modified)
+    policy = cache_control(request)
+    if policy:
+        headers['Cache-Control'] = policy
+
+    return headers
+
+
+def render_rows(rows: list, content: Callable[[], Any]) -> RenderedResponse:
+    etag, last_modified = validators(rows)
+
+    return RenderedResponse(JSONResponse(content()).body, etag, last_modified)
+
+
+def rendered_response(request: Request, rendered: RenderedResponse):
+    headers = _headers(request, rendered.etag, rendered.last_modified)
+    if not_modified(request, rendered.etag, rendered.last_modified):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    return Response(
+        rendered.body, media_type='application/json', headers=headers
+    )
+
+
+def conditional_response(
+    request: Request, rows: list, render: Callable[[], Any]
+) -> Response:
+    """304 if the client's copy of `rows` is current, else `render()`."""
+    etag, last_modified = validators(rows)
+    headers = _headers(request, etag, last_modified)
+
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    return JSONResponse(render(), headers=headers)
@@ -0,0 +1,321 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Annotated, Awaitable, Callable, Protocol
+
+from fastapi import Depends, HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from project.config import settings
+from project.database import get_db
+from project.models.base import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+@dataclass
+class StoredResponse:
+    status_code: int
+    body: dict
+
+
+class IdempotencyStore(Protocol):
+    async def claim(
+        self, key: str, fingerprint: str
+    ) -> StoredResponse | None: ...
+
+    async def complete(
+        self, key: str, fingerprint: str, response: StoredResponse
+    ): ...
+
+    async def release(self, key: str): ...
+
+
+def fingerprint(*parts: str) -> str:
+    # Keyed so that stored fingerprints of bodies carrying secrets (signup
+    # passwords) cannot be brute-forced from the idempotency table.
+    return hmac.new(
+        settings.SECRET_KEY.encode(),
+        '\x1f'.join(parts).encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def _check_claim(record_fingerprint: str, stored, fingerprint: str):
+    if record_fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail='Idempotency-Key reused with a different request',
+        )
+    if stored is None:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='A request with this Idempotency-Key is in progress',
+        )
+
+
+class MemoryIdempotencyStore:
+    """Per-process store; entries expire in insertion order.
+
+    Every key gets the same TTL, so the OrderedDict is also ordered by
+    expiry and eviction only ever pops from the front.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.IDEMPOTENCY_TTL_SECONDS,
+        max_keys: int = settings.IDEMPOTENCY_MAX_KEYS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.clock = clock
+        self._entries: OrderedDict[
+            str, tuple[float, str, StoredResponse | None]
+        ] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def evict_expired(self):
+        # Also makes room for one more key when the store is full.
+        now = self.clock()
+        while self._entries:
+            expires_at, _, _ = next(iter(self._entries.values()))
+            if expires_at > now and len(self._entries) < self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    async def claim(self, key: str, fingerprint: str):
+        self.evict_expired()
+
+        if key in self._entries:
+            _, record_fingerprint, stored = self._entries[key]
+            _check_claim(record_fingerprint, stored, fingerprint)
+            return stored
+
+        self._entries[key] = (self.clock() + self.ttl, fingerprint, None)
+
+        return None
+
+    async def complete(
+        self, key: str, fingerprint: str, response: StoredResponse
+    ):
+        self._entries[key] = (self.clock() + self.ttl, fingerprint, response)
+        self._entries.move_to_end(key)
+
+    async def release(self, key: str):
+        self._entries.pop(key, None)
+
+
+class PostgresIdempotencyStore:
+    """Store shared by every worker, kept in the idempotency_keys table."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        ttl: float = settings.IDEMPOTENCY_TTL_SECONDS,
+        evict_batch: int = 500,
+    ):
+        self.session = session
+        self.ttl = ttl
+        self.evict_batch = evict_batch
+
+    def _expires_at(self) -> datetime:
+        return datetime.now() + timedelta(seconds=self.ttl)
+
+    async def evict_expired(self) -> int:
+        expired = (
+            select(IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < datetime.now())
+            .limit(self.evict_batch)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired))
+        )
+        await self.session.commit()
+
+        return result.rowcount
+
+    async def claim(self, key: str, fingerprint: str):
+        # Claims a new key, or takes over one whose TTL ran out, atomically.
+        stmt = insert(IdempotencyKey).values(
+            key=key, fingerprint=fingerprint, expires_at=self._expires_at()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={
+                'fingerprint': stmt.excluded.fingerprint,
+                'expires_at': stmt.excluded.expires_at,
+                'status_code': None,
+                'response': None,
+            },
+            where=IdempotencyKey.expires_at < datetime.now(),
+        ).returning(IdempotencyKey.key)
+
+        claimed = await self.session.scalar(stmt)
+        await self.session.commit()
+        if claimed:
+            return None
+
+        record = await self.session.get(
+            IdempotencyKey, key, populate_existing=True
+        )
+        stored = None
+        if record.status_code is not None:
+            stored = StoredResponse(
+                record.status_code, json.loads(record.response)
+            )
+        _check_claim(record.fingerprint, stored, fingerprint)
+
+        return stored
+
+    async def complete(
+        self, key: str, fingerprint: str, response: StoredResponse
+    ):
+        stmt = insert(IdempotencyKey).values(
+            key=key,
+            fingerprint=fingerprint,
+            expires_at=self._expires_at(),
+            status_code=response.status_code,
+            response=json.dumps(response.body),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.key],
+            set_={
+                'status_code': stmt.excluded.status_code,
+                'response': stmt.excluded.response,
+                'expires_at': stmt.excluded.expires_at,
+            },
+        )
+        await self.session.execute(stmt)
+        await self.session.commit()
+
+    async def release(self, key: str):
+        await self.session.rollback()
+        await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key == key)
+        )
+        await self.session.commit()
+
+
+class IdempotencyKeyEvictor:
+    """Deletes expired idempotency_keys rows every `interval` seconds.
+
+    A claim only takes over an expired key when the same key comes back,
+    so without this the table keeps every key ever used. Each worker runs
+    one; batches skip rows another worker is already deleting.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        interval: float = settings.IDEMPOTENCY_EVICT_INTERVAL_SECONDS,
+        batch: int = 500,
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.batch = batch
+        self.evicted = 0
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        evicted = 0
+        async with AsyncSession(self.engine) as session:
+            store = PostgresIdempotencyStore(session, evict_batch=self.batch)
+            while True:
+                count = await store.evict_expired()
+                evicted += count
+                if count < self.batch:
+                    break
+        self.evicted += evicted
+
+        return evicted
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception('Idempotency key eviction failed')
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+memory_store = MemoryIdempotencyStore()
+
+
+def get_idempotency_store(
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> IdempotencyStore:
+    if settings.IDEMPOTENCY_BACKEND == 'postgres':
+        return PostgresIdempotencyStore(session)
+
+    return memory_store
+
+
+async def run_idempotent(
+    store: IdempotencyStore,
+    key: str,
+    fingerprint: str,
+    operation: Callable[[], Awaitable[dict]],
+    status_code: int,
+):
+    """Run `operation` once per key, replaying its stored response after.
+
+    Client errors are stored too, so a retry of a request that already
+    failed with 409 is answered without re-running the operation; server
+    errors release the key so the retry can actually try again.
+    """
+    stored = await store.claim(key, fingerprint)
+    if stored is not None:
+        return JSONResponse(
+            stored.body,
+            status_code=stored.status_code,
+            headers={REPLAYED_HEADER: 'true'},
+        )
+
+    try:
+        body = await operation()
+    except HTTPException as exc:
+        if exc.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            await store.release(key)
+        else:
+            await store.complete(
+                key,
+                fingerprint,
+                StoredResponse(exc.status_code, {'detail': exc.detail}),
+            )
+        raise
+    except Exception:
+        await store.release(key)
+        raise
+
+    await store.complete(key, fingerprint, StoredResponse(status_code, body))
+
+    return body
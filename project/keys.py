@@ -0,0 +1,163 @@
+"""JWT keys, parsed once and kept as ready-to-use key objects.
+
+The HMAC key from SECRET_KEY/ALGORITHM is always loaded; it has no key id
+and keeps verifying tokens issued before a switch to asymmetric keys.
+PEM files in JWT_KEYS_DIR (private keys sign and verify, public keys only
+verify) are loaded with their file name as key id, and JWT_ACTIVE_KID
+chooses which one signs. To rotate: add the new key, deploy, switch
+JWT_ACTIVE_KID once verifiers have fetched the JWKS, and remove the old
+key after ACCESS_TOKEN_EXPIRE_MINUTES.
+
+Asymmetric keys need the `cryptography` package (pyjwt[crypto]).
+"""
+
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+from jwt import InvalidTokenError, decode, encode, get_unverified_header
+from jwt.algorithms import get_default_algorithms
+
+from project.config import settings
+
+_ALGORITHMS = get_default_algorithms()
+_EC_ALGORITHMS = {
+    'secp256r1': 'ES256',
+    'secp384r1': 'ES384',
+    'secp521r1': 'ES512',
+}
+
+
+@dataclass(frozen=True)
+class Key:
+    kid: str | None
+    algorithm: str
+    signing: Any
+    verifying: Any
+
+    @property
+    def public(self) -> bool:
+        return not self.algorithm.startswith('HS')
+
+    def jwk(self) -> dict:
+        jwk = _ALGORITHMS[self.algorithm].to_jwk(self.verifying, as_dict=True)
+
+        return {**jwk, 'kid': self.kid, 'alg': self.algorithm, 'use': 'sig'}
+
+
+def hmac_key(secret: str, algorithm: str) -> Key:
+    prepared = _ALGORITHMS[algorithm].prepare_key(secret)
+
+    return Key(None, algorithm, prepared, prepared)
+
+
+def _algorithm_for(public_key) -> str:
+    from cryptography.hazmat.primitives.asymmetric import (  # noqa: PLC0415
+        ec,
+        ed448,
+        ed25519,
+        rsa,
+    )
+
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return 'RS256'
+    if isinstance(
+        public_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)
+    ):
+        return 'EdDSA'
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return _EC_ALGORITHMS[public_key.curve.name]
+
+    raise ValueError(f'Unsupported key type: {type(public_key).__name__}')
+
+
+def pem_key(data: bytes, kid: str) -> Key:
+    try:
+        from cryptography.hazmat.primitives import (  # noqa: PLC0415
+            serialization,
+        )
+    except ImportError as exc:
+        raise RuntimeError(
+            'Asymmetric JWT keys require `cryptography` (pyjwt[crypto])'
+        ) from exc
+
+    if b'PRIVATE KEY' in data:
+        private_key = serialization.load_pem_private_key(data, password=None)
+        public_key = private_key.public_key()
+    else:
+        private_key = None
+        public_key = serialization.load_pem_public_key(data)
+
+    return Key(kid, _algorithm_for(public_key), private_key, public_key)
+
+
+class KeyRing:
+    # Tokens signed with the same key share their header segment, so the
+    # key for a header is looked up once instead of decoding it per token.
+    MAX_CACHED_HEADERS = 64
+
+    def __init__(self, keys: list[Key], active_kid: str | None = None):
+        self.keys = {key.kid: key for key in keys}
+        self.active = self.keys[active_kid]
+        if self.active.signing is None:
+            raise ValueError(f'Key {active_kid!r} cannot sign (public key)')
+        self._by_header: dict[str, Key] = {}
+
+    def _key_for(self, token: str) -> Key:
+        header = token.partition('.')[0]
+        key = self._by_header.get(header)
+        if key is None:
+            key = self.keys.get(get_unverified_header(token).get('kid'))
+            if key is None:
+                raise InvalidTokenError('Unknown key id')
+            if len(self._by_header) < self.MAX_CACHED_HEADERS:
+                self._by_header[header] = key
+
+        return key
+
+    def sign(self, payload: dict) -> str:
+        key = self.active
+        headers = {'kid': key.kid} if key.kid else None
+
+        return encode(
+            payload, key.signing, algorithm=key.algorithm, headers=headers
+        )
+
+    def verify(self, token: str) -> dict:
+        """Decoded claims; raises jwt.InvalidTokenError like jwt.decode."""
+        key = self._key_for(token)
+
+        # Pinning the key's own algorithm rules out algorithm confusion.
+        return decode(token, key.verifying, algorithms=[key.algorithm])
+
+    def jwks(self) -> dict:
+        return {
+            'keys': [key.jwk() for key in self.keys.values() if key.public]
+        }
+
+
+def load_keyring(
+    secret: str,
+    algorithm: str,
+    keys_dir: str | None = None,
+    active_kid: str | None = None,
+) -> KeyRing:
+    keys = [hmac_key(secret, algorithm)]
+    if keys_dir:
+        keys.extend(
+            pem_key(path.read_bytes(), kid=path.stem)
+            for path in sorted(Path(keys_dir).glob('*.pem'))
+        )
+
+    return KeyRing(keys, active_kid)
+
+
+@cache
+def get_keyring() -> KeyRing:
+    return load_keyring(
+        settings.SECRET_KEY,
+        settings.ALGORITHM,
+        settings.JWT_KEYS_DIR,
+        settings.JWT_ACTIVE_KID,
+    )
@@ -1,17 +1,121 @@
-# ruff: noqa: E402, F401, I001
+import asyncio
+from contextlib import asynccontextmanager
 
-from . import models
 from fastapi import FastAPI
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .database import dispose_engines, get_engine, warm_up
+from .idempotency import IdempotencyKeyEvictor
+from .keys import get_keyring
+from .middleware import AdmissionControlMiddleware, ReadYourWritesMiddleware
+from .models.base import User, configure_models
+from .monitoring import LoopLagMonitor
+from .reaper import OrderReaper
+from .response_cache import get_response_cache
+from .routers.auth import jwks_router
 from .routers.auth import router as auth_router
+from .routers.health import router as health_router
+from .routers.metrics import router as metrics_router
+from .routers.orders import router as orders_router
+from .routers.products import router as products_router
+from .routers.profiling import router as profiling_router
 from .routers.users import admin_router, client_router
+from .security import password_context
+
+
+def warm_statements():
+    # Same shape as the user lookups behind login and every authenticated
+    # request, so they share compiled-cache entries.
+    email = 'warm-up@localhost'
+    return [
+        select(User).where(User.email == email),
+        select(User).where(
+            and_(User.email == email, User.is_deleted == False)  # noqa
+        ),
+    ]
+
+
+def create_app(engine: AsyncEngine | None = None) -> FastAPI:
+    """Build the application; `uvicorn --factory project.main:create_app`.
+
+    Pass `engine` to warm up an existing engine (e.g. in tests) instead of
+    the one configured in settings; the app then leaves disposing it to
+    the caller.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Runs in each worker after the fork, so no pool is shared between
+        # processes. Readiness stays false until the pool is warm.
+        app.state.ready = False
+        app.state.engine = engine or get_engine()
+        configure_models()
+        password_context()
+        get_keyring()
+        await warm_up(
+            app.state.engine,
+            min(settings.DB_POOL_WARMUP, settings.DB_POOL_SIZE),
+            warm_statements(),
+        )
+        if settings.LOOP_DEBUG:
+            # asyncio's own development aid: logs every callback slower
+            # than the threshold (and warns about never-awaited coroutines).
+            loop = asyncio.get_running_loop()
+            loop.set_debug(True)
+            loop.slow_callback_duration = settings.LOOP_BLOCK_THRESHOLD_SECONDS
+        app.state.loop_monitor.start()
+        if settings.ORDER_REAPER_ENABLED:
+            app.state.order_reaper = OrderReaper(
+                app.state.engine, get_response_cache()
+            )
+            app.state.order_reaper.start()
+        if settings.IDEMPOTENCY_BACKEND == 'postgres':
+            app.state.idempotency_evictor = IdempotencyKeyEvictor(
+                app.state.engine
+            )
+            app.state.idempotency_evictor.start()
+        app.state.ready = True
+        yield
+        app.state.ready = False
+        await app.state.loop_monitor.stop()
+        if settings.ORDER_REAPER_ENABLED:
+            await app.state.order_reaper.stop()
+        if settings.IDEMPOTENCY_BACKEND == 'postgres':
+            await app.state.idempotency_evictor.stop()
+        if engine is None:
+            await dispose_engines()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.loop_monitor = LoopLagMonitor(
+        interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+        block_threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS
+        if settings.LOOP_WATCHDOG_ENABLED
+        else None,
+    )
+
+    if settings.DB_REPLICA_URL:
+        app.add_middleware(ReadYourWritesMiddleware)
+
+    if settings.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(AdmissionControlMiddleware, state=app.state)
+
+    app.include_router(admin_router)
+    app.include_router(client_router)
+    app.include_router(products_router)
+    app.include_router(orders_router)
+    app.include_router(auth_router)
+    app.include_router(jwks_router)
+    app.include_router(health_router)
+    app.include_router(metrics_router)
+    app.include_router(profiling_router)
 
-app = FastAPI()
+    @app.get('/')
+    async def root():
+        return {'message': 'Hello World'}
 
-app.include_router(admin_router)
-app.include_router(client_router)
-app.include_router(auth_router)
+    return app
 
 
-@app.get('/')
-async def root():
-    return {'message': 'Hello World'}
+app = create_app()
@@ -0,0 +1,249 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from http import HTTPStatus
+
+from starlette.responses import JSONResponse
+
+from project.config import settings
+from project.database import PRIMARY_STICKY_COOKIE
+
+SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+class ReadYourWritesMiddleware:
+    """Pin a client to the primary for a short window after it writes."""
+
+    def __init__(
+        self,
+        app,
+        stickiness: float = settings.DB_REPLICA_STICKINESS_SECONDS,
+    ):
+        self.app = app
+        self.stickiness = stickiness
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if (
+                message['type'] == 'http.response.start'
+                and message['status'] < HTTPStatus.BAD_REQUEST
+            ):
+                until = time.time() + self.stickiness
+                cookie = (
+                    f'{PRIMARY_STICKY_COOKIE}={until:.3f}; '
+                    f'Max-Age={int(self.stickiness) + 1}; Path=/; HttpOnly'
+                )
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (b'set-cookie', cookie.encode('latin-1')),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+@dataclass(frozen=True)
+class RouteBudget:
+    limit: int
+    queue: int
+    timeout: float
+    target_latency: float | None = None
+    min_limit: int = 1
+    max_limit: int | None = None
+
+
+class AdaptiveLimiter:
+    """Concurrency limit with a bounded FIFO queue.
+
+    When the budget has a target latency the limit adapts AIMD-style:
+    every completion under target grows it by 1/limit (about +1 per
+    window), a completion over target shrinks it by 10%, at most once per
+    window so a burst of slow requests does not collapse it to the floor.
+    """
+
+    def __init__(self, budget: RouteBudget):
+        self.budget = budget
+        self.limit = float(budget.limit)
+        self.max_limit = budget.max_limit or budget.limit * 4
+        self.inflight = 0
+        self.shed = 0
+        self.latency = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._since_decrease = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _has_capacity(self) -> bool:
+        return self.inflight < int(self.limit)
+
+    async def acquire(self) -> bool:
+        if self._has_capacity() and not self._waiters:
+            self.inflight += 1
+            return True
+
+        if len(self._waiters) >= self.budget.queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter, self.budget.timeout)
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return True
+            # A release() between the timeout and this task resuming may
+            # have popped the cancelled waiter already.
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # release() handed this request a slot it will never use.
+                self.inflight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+        return True
+
+    def release(self, latency: float):
+        self.inflight -= 1
+        self._adapt(latency)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.inflight += 1
+                waiter.set_result(None)
+
+    def _adapt(self, latency: float):
+        self.latency = 0.8 * self.latency + 0.2 * latency
+        target = self.budget.target_latency
+        if target is None:
+            return
+
+        self._since_decrease += 1
+        if latency > target:
+            if self._since_decrease >= self.limit:
+                self.limit = max(self.budget.min_limit, self.limit * 0.9)
+                self._since_decrease = 0
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def snapshot(self) -> dict:
+        return {
+            'limit': int(self.limit),
+            'inflight': self.inflight,
+            'queued': self.queued,
+            'shed': self.shed,
+            'latency_ewma': round(self.latency, 4),
+        }
+
+
+DEFAULT_BUDGETS = {
+    ('POST', '/auth/token'): RouteBudget(
+        limit=8, queue=32, timeout=2.0, target_latency=0.5
+    ),
+    ('POST', '/client'): RouteBudget(
+        limit=8, queue=32, timeout=2.0, target_latency=0.5
+    ),
+    ('PUT', '/client'): RouteBudget(
+        limit=4, queue=16, timeout=2.0, target_latency=0.5
+    ),
+    ('POST', '/admin'): RouteBudget(
+        limit=4, queue=16, timeout=2.0, target_latency=0.5
+    ),
+    ('GET', '/admin'): RouteBudget(
+        limit=16, queue=64, timeout=1.0, target_latency=0.25
+    ),
+    # Long-running by design; kept out of the listing budget above.
+    ('GET', '/admin/profile'): RouteBudget(limit=1, queue=0, timeout=1.0),
+}
+
+
+class AdmissionControlMiddleware:
+    """Per-route admission control that sheds load with 503 + Retry-After.
+
+    Each (method, path prefix) budget gets its own limiter, so expensive
+    routes queue and shed independently while routes without a budget,
+    such as `/` and the docs, are never throttled.
+
+    Pass the application's `state` to publish the instance as
+    `state.admission`, which `/metrics` reads the limiter snapshots from.
+    """
+
+    def __init__(
+        self,
+        app,
+        budgets: dict[tuple[str, str], RouteBudget] | None = None,
+        retry_after: int = 1,
+        state=None,
+    ):
+        self.app = app
+        self.retry_after = retry_after
+        self.limiters = {
+            key: AdaptiveLimiter(budget)
+            for key, budget in (budgets or DEFAULT_BUDGETS).items()
+        }
+        if state is not None:
+            state.admission = self
+
+    def match(self, method: str, path: str) -> AdaptiveLimiter | None:
+        best = None
+        best_length = -1
+        for (route_method, prefix), limiter in self.limiters.items():
+            if route_method not in {method, '*'}:
+                continue
+            base = prefix.rstrip('/')
+            if path not in {base, f'{base}/'} and not path.startswith(
+                f'{base}/'
+            ):
+                continue
+            if len(base) > best_length:
+                best, best_length = limiter, len(base)
+
+        return best
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.match(scope['method'], scope['path'])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limiter.acquire():
+            response = JSONResponse(
+                {'detail': 'Service overloaded, try again later'},
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        return {
+            f'{method} {prefix}': limiter.snapshot()
+            for (method, prefix), limiter in self.limiters.items()
+        }
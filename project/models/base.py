@@ -2,7 +2,18 @@ import enum
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import CheckConstraint, Column, Enum, ForeignKey, String, Table
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    func,
+)
 from sqlalchemy.ext.declarative import AbstractConcreteBase
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -12,7 +23,7 @@ from sqlalchemy.orm import (
     relationship,
 )
 
-from project.utils.mixins import BaseMixins
+from project.utils.mixins import BaseMixins, CreateMixin
 
 
 class OrderStatus(enum.Enum):
@@ -41,6 +52,7 @@ order_products_association_table = Table(
     Base.metadata,
     Column('product_id', ForeignKey('products.id')),
     Column('order_id', ForeignKey('orders.id')),
+    Column('quantity', Integer, nullable=False, server_default='1'),
 )
 
 
@@ -82,6 +94,32 @@ class Admin(MappedAsDataclass, User, BaseMixins):
     role: Mapped[str] = mapped_column(Enum(Role), default=Role.ADMIN)
 
 
+def _search_indexes(table: Table):
+    """Indexes behind the admin user-listing filters.
+
+    `text_pattern_ops` btrees serve case-insensitive equality and prefix
+    search (`lower(name) LIKE 'ab%'`). CPFs are stored as bare digits, so
+    they need no lower(). Substring search is served by trigram indexes,
+    which need pg_trgm and are created only by the migration.
+    """
+    for column in ('name', 'email'):
+        lowered = func.lower(table.c[column]).label(f'{column}_lower')
+        Index(
+            f'ix_{table.name}_{column}_lower',
+            lowered,
+            postgresql_ops={lowered.name: 'text_pattern_ops'},
+        )
+    Index(
+        f'ix_{table.name}_cpf_pattern',
+        table.c.cpf,
+        postgresql_ops={'cpf': 'text_pattern_ops'},
+    )
+
+
+_search_indexes(Client.__table__)
+_search_indexes(Admin.__table__)
+
+
 class Order(MappedAsDataclass, Base, BaseMixins):
     __tablename__ = 'orders'
 
@@ -120,4 +158,107 @@ class Product(MappedAsDataclass, Base, BaseMixins):
     )
 
 
-Base.registry.configure()
+# Operational reports on live products (see routers/products.py); each
+# ends in `id` so keyset pagination continues straight from the index.
+_live_product = Product.is_deleted == False  # noqa
+Index(
+    'ix_products_live_section_expiration',
+    Product.section,
+    Product.expiration_date,
+    Product.id,
+    postgresql_where=_live_product,
+)
+Index(
+    'ix_products_live_expiration',
+    Product.expiration_date,
+    Product.id,
+    postgresql_where=_live_product,
+)
+Index(
+    'ix_products_live_stock',
+    Product.stock,
+    Product.id,
+    postgresql_where=_live_product,
+)
+# The fulfillment queue and the stale-order reaper only read pending orders.
+Index(
+    'ix_orders_pending',
+    Order.created_at,
+    Order.id,
+    postgresql_where=Order.status == OrderStatus.PENDING,
+)
+# Batch stock adjustments identify products by barcode.
+Index(
+    'ix_products_live_barcode',
+    Product.barcode,
+    postgresql_where=_live_product,
+)
+
+
+class RefreshToken(MappedAsDataclass, Base, CreateMixin):
+    __tablename__ = 'refresh_tokens'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    family_id: Mapped[str] = mapped_column(String(32), index=True)
+    # The user's email, like the `sub` claim of access tokens.
+    subject: Mapped[str] = mapped_column(index=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+    used_at: Mapped[datetime | None] = mapped_column(default=None)
+    revoked_at: Mapped[datetime | None] = mapped_column(default=None)
+
+
+class TokenRevocation(MappedAsDataclass, Base, CreateMixin):
+    __tablename__ = 'token_revocations'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    jti: Mapped[str] = mapped_column(String(32), unique=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+
+
+class IdempotencyKey(MappedAsDataclass, Base, CreateMixin):
+    __tablename__ = 'idempotency_keys'
+
+    key: Mapped[str] = mapped_column(String(300), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+    status_code: Mapped[int | None] = mapped_column(default=None)
+    response: Mapped[str | None] = mapped_column(default=None)
+
+
+def archive_table(source: Table) -> Table:
+    return Table(
+        f'{source.name}_archive',
+        Base.metadata,
+        *(
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.primary_key,
+                # Archived rows keep their original ids.
+                autoincrement=False,
+                nullable=column.nullable,
+            )
+            for column in source.columns
+        ),
+        Column(
+            'archived_at',
+            DateTime,
+            server_default=func.now(),
+            nullable=False,
+            index=True,
+        ),
+    )
+
+
+clients_archive_table = archive_table(Client.__table__)
+admins_archive_table = archive_table(Admin.__table__)
+products_archive_table = archive_table(Product.__table__)
+
+
+def configure_models():
+    """Map the polymorphic `User` base over its concrete tables.
+
+    Run at app startup rather than on import; it is a no-op once done.
+    """
+    Base.registry.configure()
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Fixed-bucket histogram rendered in the Prometheus text format."""
+
+    def __init__(self, buckets=LAG_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+
+    def render(self, name: str, help: str) -> list[str]:
+        lines = [f'# HELP {name} {help}', f'# TYPE {name} histogram']
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.extend([
+            f'{name}_bucket{{le="+Inf"}} {self.count}',
+            f'{name}_sum {self.sum}',
+            f'{name}_count {self.count}',
+        ])
+
+        return lines
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task.
+
+    A task sleeps `interval` seconds at a time; anything beyond that is
+    time the loop spent running something else without yielding. Every
+    measurement goes into `histogram`.
+
+    With `block_threshold` set, a watchdog thread also checks the task's
+    heartbeat. When the loop has been stuck for longer than the threshold,
+    the watchdog logs the loop thread's current stack once, which is the
+    code that is blocking it. Both wake up once per `interval`, so the
+    monitor is cheap enough to leave on in production.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        window: int = 50,
+        block_threshold: float | None = None,
+    ):
+        self.interval = interval
+        self.window = window
+        self.block_threshold = block_threshold
+        self.lag = 0.0
+        self.blocked = 0
+        self.histogram = Histogram()
+        self._recent: list[float] = []
+        self._task: asyncio.Task | None = None
+        self._heartbeat = time.perf_counter()
+        self._loop_thread: int | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @property
+    def max_lag(self) -> float:
+        return max(self._recent, default=0.0)
+
+    def record(self, lag: float):
+        self.lag = lag
+        self.histogram.observe(lag)
+        self._recent.append(lag)
+        if len(self._recent) > self.window:
+            del self._recent[0]
+
+    async def _run(self):
+        while True:
+            started = self._heartbeat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.record(
+                max(0.0, time.perf_counter() - started - self.interval)
+            )
+
+    def _watch(self):
+        reported = None
+        while not self._stopping.wait(self.interval):
+            heartbeat = self._heartbeat
+            stalled = time.perf_counter() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == reported:
+                continue
+            reported = heartbeat
+            self.blocked += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            logger.warning(
+                'Event loop blocked for more than %.3fs at:\n%s',
+                stalled,
+                ''.join(traceback.format_stack(frame)) if frame else '?',
+            )
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+        if self.block_threshold is not None:
+            self._loop_thread = threading.get_ident()
+            self._stopping.clear()
+            self._watchdog = threading.Thread(
+                target=self._watch, name='loop-watchdog', daemon=True
+            )
+            self._watchdog.start()
+
+    async def stop(self):
+        if self._watchdog is not None:
+            self._stopping.set()
+            self._watchdog.join()
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    size = pool.size()
+    # QueuePool has no public accessor for its overflow limit.
+    capacity = size + max(getattr(pool, '_max_overflow', 0), 0)
+    checked_out = pool.checkedout()
+
+    return {
+        'size': size,
+        'checked_out': checked_out,
+        'overflow': max(pool.overflow(), 0),
+        'utilization': round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+async def check_database(engine: AsyncEngine, timeout: float) -> dict:
+    """Run `SELECT 1`, giving up after `timeout` seconds.
+
+    The timeout also covers waiting for a pool connection, so an exhausted
+    pool shows up here as a failure rather than a hung probe.
+    """
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text('SELECT 1'))
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(ping(), timeout)
+    except TimeoutError:
+        return {'ok': False, 'error': f'timed out after {timeout}s'}
+    except Exception as exc:  # noqa: BLE001
+        return {'ok': False, 'error': type(exc).__name__}
+
+    return {
+        'ok': True,
+        'latency_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
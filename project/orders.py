@@ -0,0 +1,49 @@
+"""Order status transitions.
+
+An order starts PENDING and moves once, to COMPLETED or CANCELED. Every
+transition is a conditional `UPDATE ... WHERE status = 'PENDING'`, so of
+two concurrent transitions on the same order exactly one matches a row;
+the other sees the committed status and changes nothing. Canceling also
+returns the order's units to stock in the same transaction.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.models.base import Order, OrderStatus, Section
+from project.stock import restock
+
+FINAL_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELED)
+
+
+async def transition(
+    session: AsyncSession, order_id: int, status: OrderStatus, *criteria
+) -> tuple[Order | None, set[Section]]:
+    """Move a pending order to `status`; the caller commits.
+
+    `criteria` further restrict the order (e.g. to its owner). Returns
+    the order, or None when no pending order matched, and the sections
+    whose stock changed.
+    """
+    if status not in FINAL_STATUSES:
+        raise ValueError(f'Cannot move an order to {status.value}')
+
+    order = await session.scalar(
+        update(Order)
+        .where(
+            Order.id == order_id,
+            Order.status == OrderStatus.PENDING,
+            *criteria,
+        )
+        .values(status=status, updated_at=datetime.now(), is_updated=True)
+        .returning(Order)
+        .execution_options(populate_existing=True)
+    )
+
+    sections = set()
+    if order is not None and status is OrderStatus.CANCELED:
+        _, sections = await restock(session, [order.id])
+
+    return order, sections
@@ -0,0 +1,208 @@
+"""Statistical profiler for a running worker.
+
+A thread samples stacks every `interval` seconds while a profile is being
+taken and does not exist otherwise, so there is no cost when idle.
+
+- `cpu` samples the Python stack of every thread (the event loop and the
+  password hashing pool) and skips threads parked waiting for work, so it
+  shows where CPU time goes.
+- `wall` samples the coroutine stack of every asyncio task, awaiting or
+  not, so it shows where requests spend their time, database round trips
+  and queueing included.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+
+MODES = ('cpu', 'wall')
+FORMATS = ('collapsed', 'speedscope')
+
+Frame = tuple[str, str, int]
+
+# Innermost Python frames of threads that are blocked waiting for work.
+_IDLE = {
+    ('selectors.py', 'select'),
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('thread.py', '_worker'),
+    ('queue.py', 'get'),
+}
+
+
+def _frame(frame: FrameType) -> Frame:
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+
+def _thread_stack(frame: FrameType) -> tuple[Frame, ...]:
+    stack = []
+    while frame is not None:
+        stack.append(_frame(frame))
+        frame = frame.f_back
+    stack.reverse()
+
+    return tuple(stack)
+
+
+def _is_idle(stack: tuple[Frame, ...]) -> bool:
+    name, filename, _ = stack[-1]
+    return (os.path.basename(filename), name) in _IDLE
+
+
+def _task_stack(task: asyncio.Task) -> tuple[Frame, ...]:
+    """Outermost-first frames of a task's chain of awaited coroutines."""
+    stack = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = (
+            getattr(awaitable, 'cr_frame', None)
+            or getattr(awaitable, 'gi_frame', None)
+            or getattr(awaitable, 'ag_frame', None)
+        )
+        if frame is None:
+            break
+        stack.append(_frame(frame))
+        awaitable = (
+            getattr(awaitable, 'cr_await', None)
+            or getattr(awaitable, 'gi_yieldfrom', None)
+            or getattr(awaitable, 'ag_await', None)
+        )
+
+    return tuple(stack)
+
+
+@dataclass
+class Profile:
+    mode: str
+    interval: float
+    duration: float = 0.0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed format, for flamegraph.pl and others."""
+        lines = [
+            ';'.join(
+                f'{name} ({os.path.basename(file)}:{line})'
+                for name, file, line in stack
+            )
+            + f' {count}'
+            for stack, count in self.stacks.most_common()
+        ]
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def speedscope(self) -> dict:
+        """A sampled profile in speedscope's file format."""
+        frames: dict[Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            samples.append([frames.setdefault(f, len(frames)) for f in stack])
+            weights.append(round(count * self.interval, 6))
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'exporter': 'project.profiler',
+            'name': f'{self.mode} profile',
+            'activeProfileIndex': 0,
+            'shared': {
+                'frames': [
+                    {'name': name, 'file': file, 'line': line}
+                    for name, file, line in frames
+                ]
+            },
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': f'{self.mode} ({self.samples} samples)',
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': round(sum(weights), 6),
+                    'samples': samples,
+                    'weights': weights,
+                }
+            ],
+        }
+
+
+class Sampler:
+    def __init__(
+        self,
+        mode: str = 'cpu',
+        interval: float = 0.005,
+        loop: asyncio.AbstractEventLoop | None = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f'mode must be one of {MODES}')
+        self.profile = Profile(mode=mode, interval=interval)
+        self.loop = loop
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._ignore: set = set()
+
+    def _sample_threads(self):
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == threading.get_ident():
+                continue
+            stack = _thread_stack(frame)
+            if stack and not _is_idle(stack):
+                self.profile.stacks[stack] += 1
+
+    def _sample_tasks(self):
+        try:
+            tasks = list(asyncio.all_tasks(self.loop))
+        except RuntimeError:  # the task set changed while copying it
+            return
+        for task in tasks:
+            if task in self._ignore:
+                continue
+            stack = _task_stack(task)
+            if stack:
+                self.profile.stacks[stack] += 1
+
+    def _run(self):
+        sample = (
+            self._sample_threads
+            if self.profile.mode == 'cpu'
+            else self._sample_tasks
+        )
+        while not self._stopping.wait(self.profile.interval):
+            sample()
+            self.profile.samples += 1
+
+    def start(self, ignore=()):
+        """Start sampling; tasks in `ignore` are left out of wall profiles."""
+        self._ignore = set(ignore)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name='profiler', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        self._stopping.set()
+        self._thread.join()
+        self.profile.duration = round(time.perf_counter() - self._started, 3)
+
+        return self.profile
+
+
+async def profile_for(
+    seconds: float, mode: str = 'cpu', interval: float = 0.005
+) -> Profile:
+    """Profile this process for `seconds` while the loop keeps serving."""
+    sampler = Sampler(mode, interval, asyncio.get_running_loop())
+    sampler.start(ignore={asyncio.current_task()})
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profile = sampler.stop()
+
+    return profile
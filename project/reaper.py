@@ -0,0 +1,165 @@
+"""Cancels orders left pending for longer than ORDER_TTL_MINUTES.
+
+A pending order holds its units out of stock; the reaper cancels
+abandoned ones in batches and returns their units with one statement per
+batch, like a cancel through the API. Candidates are locked with
+`FOR UPDATE SKIP LOCKED`, so reapers on several replicas take disjoint
+batches, and an order being completed or canceled concurrently is
+skipped (and then no longer pending) rather than waited for.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from project.config import settings
+from project.models.base import Order, OrderStatus, Section
+from project.response_cache import ResponseCache
+from project.stock import restock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReapReport:
+    batches: int = 0
+    orders: int = 0
+    units: int = 0
+    sections: set[Section] = field(default_factory=set)
+
+
+def _stale_orders(cutoff: datetime, limit: int):
+    return (
+        select(Order.id)
+        .where(
+            Order.status == OrderStatus.PENDING,
+            Order.created_at < cutoff,
+        )
+        .order_by(Order.created_at, Order.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte('stale')
+    )
+
+
+async def reap_stale_orders(
+    session: AsyncSession,
+    ttl_minutes: int = settings.ORDER_TTL_MINUTES,
+    batch_size: int = settings.ORDER_REAPER_BATCH_SIZE,
+) -> ReapReport:
+    """Cancel orders pending for over `ttl_minutes`, a batch per commit."""
+    cutoff = datetime.now() - timedelta(minutes=ttl_minutes)
+    report = ReapReport()
+
+    while True:
+        stale = _stale_orders(cutoff, batch_size)
+        ids = (
+            await session.scalars(
+                update(Order)
+                .where(Order.id.in_(select(stale.c.id)))
+                .values(
+                    status=OrderStatus.CANCELED,
+                    updated_at=datetime.now(),
+                    is_updated=True,
+                )
+                .returning(Order.id)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        if not ids:
+            await session.commit()
+            break
+
+        units, sections = await restock(session, ids)
+        await session.commit()
+
+        report.batches += 1
+        report.orders += len(ids)
+        report.units += units
+        report.sections |= sections
+
+        if len(ids) < batch_size:
+            break
+
+    return report
+
+
+class OrderReaper:
+    """Runs `reap_stale_orders` every `interval` seconds in the background.
+
+    Totals since start are kept for /metrics. A failed run is logged and
+    counted, and the next one is tried after the usual interval.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        cache: ResponseCache | None = None,
+        interval: float = settings.ORDER_REAPER_INTERVAL_SECONDS,
+        ttl_minutes: int = settings.ORDER_TTL_MINUTES,
+        batch_size: int = settings.ORDER_REAPER_BATCH_SIZE,
+    ):
+        self.engine = engine
+        self.cache = cache
+        self.interval = interval
+        self.ttl_minutes = ttl_minutes
+        self.batch_size = batch_size
+        self.runs = 0
+        self.errors = 0
+        self.orders = 0
+        self.units = 0
+        self.last_duration = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> ReapReport:
+        started = time.perf_counter()
+        async with AsyncSession(self.engine) as session:
+            report = await reap_stale_orders(
+                session, self.ttl_minutes, self.batch_size
+            )
+        self.runs += 1
+        self.orders += report.orders
+        self.units += report.units
+        self.last_duration = time.perf_counter() - started
+
+        if report.sections and self.cache is not None:
+            from project.routers.products import (  # noqa: PLC0415
+                invalidate_sections,
+            )
+
+            await invalidate_sections(self.cache, *report.sections)
+        if report.orders:
+            logger.info(
+                'Canceled %d stale orders, %d units back in stock',
+                report.orders,
+                report.units,
+            )
+
+        return report
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception:
+                self.errors += 1
+                logger.exception('Stale order reaper failed')
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
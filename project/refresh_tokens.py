@@ -0,0 +1,119 @@
+"""Opaque refresh tokens, rotated on every use.
+
+Only a SHA-256 digest of each token is stored; the tokens are 256 random
+bits, so a fast hash is enough and refreshing never pays for Argon2.
+Every rotation issues a new token in the same family. Presenting a token
+that was already used means it leaked (or the client replayed it), so the
+whole family is revoked and its holder has to log in again.
+"""
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.config import settings
+from project.models.base import RefreshToken
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.UNAUTHORIZED,
+        detail=detail,
+        headers={'WWW-Authenticate': 'Bearer'},
+    )
+
+
+def issue(
+    session: AsyncSession, subject: str, family_id: str | None = None
+) -> str:
+    """Add a new refresh token for `subject`; the caller commits."""
+    token = secrets.token_urlsafe(32)
+    session.add(
+        RefreshToken(
+            token_hash=_digest(token),
+            family_id=family_id or uuid.uuid4().hex,
+            subject=subject,
+            expires_at=datetime.now()
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+
+    return token
+
+
+async def rotate(session: AsyncSession, token: str) -> tuple[str, str]:
+    """Spend `token` and return its subject and the next refresh token."""
+    now = datetime.now()
+    digest = _digest(token)
+
+    # Marking the token used and reading it in one statement makes
+    # concurrent uses of the same token race for a single row lock.
+    spent = await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == digest,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(used_at=now)
+        .returning(RefreshToken.subject, RefreshToken.family_id)
+    )
+    row = spent.first()
+
+    if row is None:
+        reused_family = await session.scalar(
+            select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == digest,
+                RefreshToken.used_at.is_not(None),
+            )
+        )
+        if reused_family is None:
+            await session.rollback()
+            raise _unauthorized('Invalid refresh token')
+
+        await revoke(session, RefreshToken.family_id == reused_family)
+        await session.commit()
+        raise _unauthorized('Refresh token reuse detected')
+
+    next_token = issue(session, row.subject, row.family_id)
+    await session.commit()
+
+    return row.subject, next_token
+
+
+async def revoke(session: AsyncSession, *criteria):
+    """Revoke every live refresh token matching `criteria`."""
+    await session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.revoked_at.is_(None), *criteria)
+        .values(revoked_at=datetime.now())
+    )
+
+
+async def revoke_subject(session: AsyncSession, subject: str):
+    await revoke(session, RefreshToken.subject == subject)
+
+
+async def revoke_family_of(session: AsyncSession, token: str, subject: str):
+    """Revoke the login `token` belongs to, if it belongs to `subject`."""
+    family = (
+        select(RefreshToken.family_id)
+        .where(RefreshToken.token_hash == _digest(token))
+        .scalar_subquery()
+    )
+    await revoke(
+        session,
+        RefreshToken.family_id == family,
+        RefreshToken.subject == subject,
+    )
@@ -0,0 +1,165 @@
+"""Shared cache of serialized responses, invalidated by version keys.
+
+Cache keys embed the current version of every scope the response depends
+on (e.g. `products:higiene@3`). Invalidating a scope only increments its
+version: entries under the old version are never read again and age out
+through the TTL or LRU eviction, so no write has to find and delete them.
+
+Backends:
+
+- `MemoryCacheBackend`: per worker, an LRU bounded by the total size of
+  the cached bodies. Invalidations reach only the worker that made them;
+  other workers serve their copy for at most RESPONSE_CACHE_TTL_SECONDS.
+- `RedisCacheBackend`: shared by every worker, over any client with the
+  redis-py asyncio API (get, set, mget, incr). Bound its memory in Redis
+  itself with `maxmemory` and `maxmemory-policy allkeys-lru`.
+"""
+
+import time
+from collections import OrderedDict, defaultdict
+from functools import cache
+from typing import Callable, Protocol
+from urllib.parse import urlencode
+
+from project.config import settings
+from project.http_cache import RenderedResponse
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float): ...
+
+    async def versions(self, scopes: list[str]) -> list[int]: ...
+
+    async def bump(self, scopes: list[str]): ...
+
+
+class MemoryCacheBackend:
+    def __init__(
+        self,
+        max_bytes: int = settings.RESPONSE_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._versions: defaultdict[str, int] = defaultdict(int)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _pop(self, key: str):
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self.clock():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (self.clock() + ttl, value)
+        self.size += len(value)
+        while self.size > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+
+    async def versions(self, scopes: list[str]) -> list[int]:
+        return [self._versions[scope] for scope in scopes]
+
+    async def bump(self, scopes: list[str]):
+        for scope in scopes:
+            self._versions[scope] += 1
+
+
+class RedisCacheBackend:
+    PREFIX = 'response-cache:'
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(self.PREFIX + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(self.PREFIX + key, value, px=int(ttl * 1000))
+
+    async def versions(self, scopes: list[str]) -> list[int]:
+        values = await self.client.mget([
+            f'{self.PREFIX}version:{scope}' for scope in scopes
+        ])
+        return [int(value or 0) for value in values]
+
+    async def bump(self, scopes: list[str]):
+        for scope in scopes:
+            await self.client.incr(f'{self.PREFIX}version:{scope}')
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float = settings.RESPONSE_CACHE_TTL_SECONDS,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+
+    async def key(self, scopes: list[str], params: dict) -> str:
+        """Key for a response that depends on `scopes`, given `params`."""
+        versions = await self.backend.versions(scopes)
+        stamped = ','.join(
+            f'{scope}@{version}' for scope, version in zip(scopes, versions)
+        )
+        query = urlencode(
+            sorted(
+                (name, value)
+                for name, value in params.items()
+                if value is not None
+            )
+        )
+
+        return f'{stamped}?{query}'
+
+    async def get(self, key: str) -> RenderedResponse | None:
+        data = await self.backend.get(key)
+
+        return None if data is None else RenderedResponse.loads(data)
+
+    async def set(self, key: str, rendered: RenderedResponse):
+        await self.backend.set(key, rendered.dumps(), self.ttl)
+
+    async def invalidate(self, scopes: list[str]):
+        await self.backend.bump(scopes)
+
+
+def _redis_client(url: str):
+    try:
+        from redis.asyncio import from_url  # noqa: PLC0415
+    except ImportError as exc:
+        raise RuntimeError(
+            "RESPONSE_CACHE_BACKEND='redis' requires the `redis` package"
+        ) from exc
+
+    return from_url(url)
+
+
+@cache
+def get_response_cache() -> ResponseCache:
+    if settings.RESPONSE_CACHE_BACKEND == 'redis':
+        backend = RedisCacheBackend(_redis_client(settings.RESPONSE_CACHE_URL))
+    else:
+        backend = MemoryCacheBackend()
+
+    return ResponseCache(backend)
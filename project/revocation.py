@@ -0,0 +1,91 @@
+"""Revoked access tokens, by `jti`.
+
+Revocations are stored in `token_revocations` and mirrored in memory, so
+checking a token is a dict lookup. At most once per `interval` seconds a
+request also fetches the rows added since the previous refresh, so a
+revocation made on another worker takes effect within `interval`; on the
+worker that made it, immediately. Only unexpired entries are kept, so the
+mirror holds at most the tokens revoked within one access token lifetime.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.config import settings
+from project.models.base import TokenRevocation
+
+
+class RevocationList:
+    # Rows are stamped with the inserting transaction's start time, so a
+    # refresh looks a little further back than the newest row it has seen.
+    OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._expiry: dict[str, datetime] = {}
+        self._watermark: datetime | None = None
+        self._next_refresh = 0.0
+        self._refreshing = False
+
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expiry
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def add(self, jti: str, expires_at: datetime):
+        self._expiry[jti] = expires_at
+
+    @property
+    def due(self) -> bool:
+        return not self._refreshing and time.monotonic() >= self._next_refresh
+
+    async def refresh(self, session: AsyncSession):
+        self._refreshing = True
+        try:
+            now = datetime.now()
+            query = select(
+                TokenRevocation.jti,
+                TokenRevocation.expires_at,
+                TokenRevocation.created_at,
+            ).where(TokenRevocation.expires_at > now)
+            if self._watermark is not None:
+                query = query.where(
+                    TokenRevocation.created_at > self._watermark - self.OVERLAP
+                )
+
+            for jti, expires_at, created_at in await session.execute(query):
+                self.add(jti, expires_at)
+                if self._watermark is None or created_at > self._watermark:
+                    self._watermark = created_at
+
+            self._expiry = {
+                jti: expires_at
+                for jti, expires_at in self._expiry.items()
+                if expires_at > now
+            }
+        finally:
+            self._refreshing = False
+            self._next_refresh = time.monotonic() + self.interval
+
+
+revocations = RevocationList(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+
+
+async def revoke(session: AsyncSession, claims: dict):
+    """Revoke the access token with these (verified) claims."""
+    jti = claims.get('jti')
+    if jti is None:  # issued before tokens carried a jti
+        return
+
+    expires_at = datetime.fromtimestamp(claims['exp'])
+    await session.execute(
+        insert(TokenRevocation)
+        .values(jti=jti, expires_at=expires_at)
+        .on_conflict_do_nothing(index_elements=['jti'])
+    )
+    revocations.add(jti, expires_at)
@@ -1,17 +1,24 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from project.config import settings
 from project.database import get_db
+from project.keys import get_keyring
 from project.models.base import User
-from project.schemas.others import Token
+from project.refresh_tokens import issue, revoke_family_of, rotate
+from project.revocation import revoke
+from project.schemas.others import Message, RefreshRequest, Token
 from project.security import (
     create_access_token,
     get_current_user,
+    hash_pool,
+    oauth2_scheme,
+    optional_oauth2_scheme,
     verify_password,
 )
 
@@ -21,9 +28,13 @@ router = APIRouter(
     responses={404: {'description': 'Not found'}},
 )
 
+jwks_router = APIRouter(tags=['auth'])
+
 Session = Annotated[AsyncSession, Depends(get_db)]
 OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
 CurrentUser = Annotated[User, Depends(get_current_user)]
+Bearer = Annotated[str, Depends(oauth2_scheme)]
+OptionalBearer = Annotated[str | None, Depends(optional_oauth2_scheme)]
 
 
 @router.post('/token', response_model=Token)
@@ -38,25 +49,84 @@ async def login_for_access_token(form_data: OAuth2Form, session: Session):
             detail='Wrong email or password',
         )
 
-    if not verify_password(form_data.password, user.password):
+    if not await hash_pool.run(
+        verify_password, form_data.password, user.password
+    ):
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
             detail='Wrong email or password',
         )
 
     access_token = create_access_token(data={'sub': user.email})
+    refresh_token = issue(session, user.email)
+    await session.commit()
     token_type = 'bearer'
 
-    token = {'access_token': access_token, 'token_type': token_type}
+    token = {
+        'access_token': access_token,
+        'token_type': token_type,
+        'refresh_token': refresh_token,
+    }
 
     return token
 
 
-@router.post('/refresh_token', response_model=Token)
-async def refresh_access_token(current_user: CurrentUser):
-    new_access_token = create_access_token(data={'sub': current_user.email})
+@router.post(
+    '/refresh_token', response_model=Token, response_model_exclude_none=True
+)
+async def refresh_access_token(
+    session: Session,
+    bearer: OptionalBearer,
+    body: RefreshRequest | None = None,
+):
+    """Trade a refresh token for a new access token and refresh token.
+
+    A refresh token works only once; presenting it again revokes every
+    token issued from the same login. Without a body, a still valid access
+    token in the Authorization header is exchanged for a new one instead.
+    """
+    if body is None:
+        current_user = await get_current_user(session, bearer or '')
+        new_access_token = create_access_token(
+            data={'sub': current_user.email}
+        )
+
+        return {'access_token': new_access_token, 'token_type': 'bearer'}
+
+    subject, refresh_token = await rotate(session, body.refresh_token)
+    new_access_token = create_access_token(data={'sub': subject})
     token_type = 'bearer'
 
-    token = {'access_token': new_access_token, 'token_type': token_type}
+    token = {
+        'access_token': new_access_token,
+        'token_type': token_type,
+        'refresh_token': refresh_token,
+    }
 
     return token
+
+
+@router.post('/logout', response_model=Message)
+async def logout(
+    session: Session,
+    current_user: CurrentUser,
+    bearer: Bearer,
+    body: RefreshRequest | None = None,
+):
+    """Revoke this access token and, if given, the refresh token's login."""
+    await revoke(session, get_keyring().verify(bearer))
+    if body is not None:
+        await revoke_family_of(session, body.refresh_token, current_user.email)
+    await session.commit()
+
+    return {'message': 'Logged out'}
+
+
+@jwks_router.get('/.well-known/jwks.json')
+async def jwks(response: Response):
+    """Public keys for verifying our access tokens without calling us."""
+    response.headers['Cache-Control'] = (
+        f'public, max-age={settings.JWKS_MAX_AGE_SECONDS}'
+    )
+
+    return get_keyring().jwks()
@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from project.config import settings
+from project.monitoring import check_database, pool_stats
+from project.security import hash_pool
+
+router = APIRouter(prefix='/health', tags=['health'])
+
+
+@router.get('/live')
+async def live(request: Request):
+    """Liveness: the worker answers. Restarting it would not fix the DB."""
+    monitor = request.app.state.loop_monitor
+
+    return {
+        'status': 'alive',
+        'loop_lag_ms': round(monitor.lag * 1000, 2),
+    }
+
+
+@router.get('/ready')
+async def ready(request: Request):
+    """200 when the worker can take traffic, 503 (with the reasons) if not.
+
+    Point the load balancer readiness probe here. A worker that is still
+    warming up, stopping, cannot reach the database or is saturated (pool,
+    password hashing or event loop) is taken out of rotation until it
+    recovers, instead of queueing more requests.
+    """
+    state = request.app.state
+    if not getattr(state, 'ready', False):
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail='Warming up',
+        )
+
+    database = await check_database(
+        state.engine, settings.HEALTH_DB_TIMEOUT_SECONDS
+    )
+    pool = pool_stats(state.engine)
+    hashing = {'workers': hash_pool.workers, 'queued': hash_pool.queued}
+    loop_lag = state.loop_monitor.max_lag
+    checks = {
+        'database': database,
+        'pool': {
+            **pool,
+            'ok': pool['utilization'] < settings.HEALTH_MAX_POOL_UTILIZATION,
+        },
+        'password_hashing': {
+            **hashing,
+            'ok': hashing['queued'] <= settings.HEALTH_MAX_HASH_QUEUE,
+        },
+        'event_loop': {
+            'max_lag_ms': round(loop_lag * 1000, 2),
+            'ok': loop_lag <= settings.HEALTH_MAX_LOOP_LAG_SECONDS,
+        },
+    }
+
+    if all(check['ok'] for check in checks.values()):
+        return {'status': 'ready', 'checks': checks}
+
+    return JSONResponse(
+        {'status': 'saturated', 'checks': checks},
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+    )
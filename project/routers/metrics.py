@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from project.monitoring import pool_stats
+from project.security import hash_pool
+
+router = APIRouter(tags=['monitoring'])
+
+
+def _gauge(name: str, help: str, value) -> list[str]:
+    return [f'# HELP {name} {help}', f'# TYPE {name} gauge', f'{name} {value}']
+
+
+def _counter(name: str, help: str, value) -> list[str]:
+    return [
+        f'# HELP {name} {help}',
+        f'# TYPE {name} counter',
+        f'{name} {value}',
+    ]
+
+
+def _labeled(
+    name: str, help: str, kind: str, label: str, values: dict
+) -> list[str]:
+    return [
+        f'# HELP {name} {help}',
+        f'# TYPE {name} {kind}',
+        *(
+            f'{name}{{{label}="{key}"}} {value}'
+            for key, value in values.items()
+        ),
+    ]
+
+
+@router.get(
+    '/metrics', response_class=PlainTextResponse, include_in_schema=False
+)
+async def metrics(request: Request):
+    """Prometheus text exposition of this worker's runtime metrics."""
+    state = request.app.state
+    monitor = state.loop_monitor
+    lines = monitor.histogram.render(
+        'event_loop_lag_seconds',
+        'Delay between a scheduled wake-up and the event loop running it.',
+    )
+    lines += [
+        '# HELP event_loop_blocked_total Times the loop was blocked for '
+        'longer than the threshold.',
+        '# TYPE event_loop_blocked_total counter',
+        f'event_loop_blocked_total {monitor.blocked}',
+    ]
+    lines += _gauge(
+        'password_hash_queued',
+        'Password hashes waiting for a hashing thread.',
+        hash_pool.queued,
+    )
+    reaper = getattr(state, 'order_reaper', None)
+    if reaper is not None:
+        lines += _counter(
+            'order_reaper_runs_total',
+            'Passes of the stale pending order reaper.',
+            reaper.runs,
+        )
+        lines += _counter(
+            'order_reaper_errors_total',
+            'Reaper passes that failed.',
+            reaper.errors,
+        )
+        lines += _counter(
+            'order_reaper_orders_canceled_total',
+            'Stale pending orders canceled by the reaper.',
+            reaper.orders,
+        )
+        lines += _counter(
+            'order_reaper_units_restocked_total',
+            'Units returned to stock by the reaper.',
+            reaper.units,
+        )
+        lines += _gauge(
+            'order_reaper_last_run_seconds',
+            'Duration of the last reaper pass.',
+            round(reaper.last_duration, 6),
+        )
+    admission = getattr(state, 'admission', None)
+    if admission is not None:
+        routes = admission.snapshot()
+        for name, field, kind, help in (
+            ('admission_limit', 'limit', 'gauge', 'Concurrency limit.'),
+            ('admission_inflight', 'inflight', 'gauge', 'Requests running.'),
+            ('admission_queued', 'queued', 'gauge', 'Requests waiting.'),
+            ('admission_shed_total', 'shed', 'counter', 'Requests shed.'),
+            (
+                'admission_latency_ewma_seconds',
+                'latency_ewma',
+                'gauge',
+                'Smoothed request latency.',
+            ),
+        ):
+            lines += _labeled(
+                name,
+                f'{help} Per admission-controlled route.',
+                kind,
+                'route',
+                {route: stats[field] for route, stats in routes.items()},
+            )
+    if hasattr(state, 'engine'):
+        pool = pool_stats(state.engine)
+        lines += _gauge(
+            'db_pool_checked_out',
+            'Database connections currently in use.',
+            pool['checked_out'],
+        )
+        lines += _gauge(
+            'db_pool_size', 'Configured database pool size.', pool['size']
+        )
+
+    return '\n'.join(lines) + '\n'
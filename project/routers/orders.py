@@ -0,0 +1,188 @@
+from collections import Counter
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_db, get_read_db
+from ..models.base import (
+    Admin,
+    Client,
+    Order,
+    OrderStatus,
+    User,
+    order_products_association_table,
+)
+from ..orders import transition
+from ..response_cache import ResponseCache, get_response_cache
+from ..schemas.orders import (
+    OrderList,
+    OrderPublic,
+    OrderSchema,
+    PendingOrderPage,
+)
+from ..security import get_current_user
+from ..stock import reserve
+from .products import invalidate_sections
+
+router = APIRouter(
+    prefix='/orders',
+    tags=['orders'],
+    responses={404: {'description': 'Not found'}},
+)
+
+Session = Annotated[AsyncSession, Depends(get_db)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+Cache = Annotated[ResponseCache, Depends(get_response_cache)]
+
+
+def _require_admin(current_user: User):
+    if not isinstance(current_user, Admin):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Not enough permissions',
+        )
+
+
+@router.post('/', response_model=OrderPublic, status_code=HTTPStatus.CREATED)
+async def create_order(
+    order: OrderSchema,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    """Place a pending order, reserving its units from stock."""
+    if not isinstance(current_user, Client):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Only clients can place orders',
+        )
+
+    quantities = Counter()
+    for item in order.items:
+        quantities[item.product_id] += item.quantity
+
+    reserved = await reserve(session, quantities)
+    if reserved is None:
+        await session.rollback()
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT, detail='Insufficient stock'
+        )
+
+    db_order = await session.scalar(
+        insert(Order)
+        .values(
+            client_id=current_user.id,
+            total=sum(
+                price * quantities[product_id]
+                for product_id, price, _ in reserved
+            ),
+        )
+        .returning(Order)
+    )
+    await session.execute(
+        insert(order_products_association_table),
+        [
+            {
+                'order_id': db_order.id,
+                'product_id': product_id,
+                'quantity': quantity,
+            }
+            for product_id, quantity in quantities.items()
+        ],
+    )
+    await session.commit()
+    await invalidate_sections(cache, *{section for *_, section in reserved})
+
+    return db_order
+
+
+@router.get('/pending', response_model=OrderList)
+async def pending_orders(
+    page: Annotated[PendingOrderPage, Query()],
+    session: ReadSession,
+    current_user: CurrentUser,
+):
+    """The fulfillment queue: pending orders, oldest first.
+
+    Pass the last order's `created_at` and `id` as `after_created` and
+    `after_id` to get the next page; each page is a scan of the partial
+    index on pending orders.
+    """
+    _require_admin(current_user)
+
+    query = select(Order).where(Order.status == OrderStatus.PENDING)
+    if page.after_created is not None and page.after_id is not None:
+        query = query.where(
+            tuple_(Order.created_at, Order.id)
+            > tuple_(page.after_created, page.after_id)
+        )
+    orders = await session.scalars(
+        query.order_by(Order.created_at, Order.id).limit(page.limit)
+    )
+
+    return {'orders': orders.all()}
+
+
+async def _finish(
+    session: AsyncSession,
+    cache: ResponseCache,
+    order_id: int,
+    status: OrderStatus,
+    *criteria,
+) -> Order:
+    db_order, sections = await transition(session, order_id, status, *criteria)
+
+    if db_order is None:
+        current = await session.scalar(
+            select(Order.status).where(Order.id == order_id, *criteria)
+        )
+        if current is None:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND, detail='Order not found'
+            )
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail=f'Order is already {current.value}',
+        )
+
+    await session.commit()
+    if sections:
+        await invalidate_sections(cache, *sections)
+
+    return db_order
+
+
+@router.post('/{order_id}/complete', response_model=OrderPublic)
+async def complete_order(
+    order_id: int,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    _require_admin(current_user)
+
+    return await _finish(session, cache, order_id, OrderStatus.COMPLETED)
+
+
+@router.post('/{order_id}/cancel', response_model=OrderPublic)
+async def cancel_order(
+    order_id: int,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    """Cancel a pending order and return its units to stock.
+
+    Admins cancel any order; clients only their own.
+    """
+    criteria = ()
+    if not isinstance(current_user, Admin):
+        criteria = (Order.client_id == current_user.id,)
+
+    return await _finish(
+        session, cache, order_id, OrderStatus.CANCELED, *criteria
+    )
@@ -0,0 +1,351 @@
+import json
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_db, get_read_db
+from ..http_cache import conditional_response, render_rows, rendered_response
+from ..models.base import Admin, Product, Section, User
+from ..response_cache import ResponseCache, get_response_cache
+from ..schemas.others import Message
+from ..schemas.products import (
+    ExpiringReportPage,
+    LowStockReportPage,
+    ProductFilterPage,
+    ProductList,
+    ProductPublic,
+    ProductSchema,
+    StockBatch,
+    StockBatchResult,
+    StockChange,
+)
+from ..security import get_current_user
+from ..stock import adjust_stock
+
+router = APIRouter(
+    prefix='/products',
+    tags=['products'],
+    responses={404: {'description': 'Not found'}},
+)
+
+Session = Annotated[AsyncSession, Depends(get_db)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_db)]
+CurrentUser = Annotated[User, Depends(get_current_user)]
+Cache = Annotated[ResponseCache, Depends(get_response_cache)]
+
+ALL_SECTIONS = 'products:*'
+
+
+def _section_scope(section: str) -> str:
+    return f'products:{section}'
+
+
+async def invalidate_sections(cache: ResponseCache, *sections: Section):
+    """Drop cached listings that may contain products of `sections`."""
+    await cache.invalidate([
+        ALL_SECTIONS,
+        *{_section_scope(section.value) for section in sections},
+    ])
+
+
+def _require_admin(current_user: User):
+    if not isinstance(current_user, Admin):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Not enough permissions',
+        )
+
+
+async def _get_live_product(session: AsyncSession, product_id: int):
+    product = await session.scalar(
+        select(Product).where(
+            Product.id == product_id,
+            Product.is_deleted == False,  # noqa
+        )
+    )
+
+    if not product:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='Product not found'
+        )
+
+    return product
+
+
+@router.get('/', response_model=ProductList)
+async def list_products(
+    request: Request,
+    filter_products: Annotated[ProductFilterPage, Query()],
+    session: ReadSession,
+    cache: Cache,
+):
+    """The catalog, served from the response cache while unchanged."""
+    section = filter_products.section
+    key = await cache.key(
+        [_section_scope(section) if section else ALL_SECTIONS],
+        filter_products.model_dump(),
+    )
+    rendered = await cache.get(key)
+
+    if rendered is None:
+        query = select(Product).where(Product.is_deleted == False)  # noqa
+        if section:
+            query = query.where(Product.section == Section(section))
+        query = (
+            query.order_by(Product.id)
+            .offset(filter_products.offset)
+            .limit(filter_products.limit)
+        )
+        products = (await session.scalars(query)).all()
+
+        rendered = render_rows(
+            products,
+            lambda: ProductList(products=products).model_dump(mode='json'),
+        )
+        await cache.set(key, rendered)
+
+    return rendered_response(request, rendered)
+
+
+@router.post('/', response_model=ProductPublic, status_code=HTTPStatus.CREATED)
+async def create_product(
+    product: ProductSchema,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    _require_admin(current_user)
+
+    db_product = Product(**{
+        **product.model_dump(),
+        'section': Section(product.section),
+    })
+    session.add(db_product)
+    await session.commit()
+    await session.refresh(db_product)
+
+    await invalidate_sections(cache, db_product.section)
+
+    return db_product
+
+
+REPORT_FETCH_SIZE = 500
+REPORT_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.section,
+    Product.stock,
+    Product.expiration_date,
+)
+
+
+def _report_query(page, order_by: tuple, after: tuple) -> Select:
+    """One keyset page of live products, in `order_by` order.
+
+    `after` holds the previous page's last values of `order_by`; the row
+    comparison continues from there inside the partial indexes instead of
+    skipping rows like OFFSET would.
+    """
+    query = select(*REPORT_COLUMNS).where(
+        Product.is_deleted == False  # noqa
+    )
+    if page.section:
+        query = query.where(Product.section == Section(page.section))
+    if None not in after:
+        query = query.where(tuple_(*order_by) > tuple_(*after))
+
+    return query.order_by(*order_by).limit(page.limit)
+
+
+def _ndjson(session: AsyncSession, query: Select) -> StreamingResponse:
+    """Stream `query` as NDJSON, fetching REPORT_FETCH_SIZE rows at a time.
+
+    The request's session is closed before the body is sent, so rows are
+    read from a server-side cursor in a session of their own, on the same
+    database (primary or replica) the request was routed to.
+    """
+    bind = session.bind
+
+    async def lines():
+        async with AsyncSession(bind) as report_session:
+            rows = await report_session.stream(
+                query.execution_options(yield_per=REPORT_FETCH_SIZE)
+            )
+            async for product_id, name, section, stock, expiration in rows:
+                yield (
+                    json.dumps({
+                        'id': product_id,
+                        'name': name,
+                        'section': section.value,
+                        'stock': stock,
+                        'expiration_date': expiration.isoformat(),
+                    })
+                    + '\n'
+                )
+
+    return StreamingResponse(lines(), media_type='application/x-ndjson')
+
+
+@router.get('/reports/expiring')
+async def expiring_report(
+    page: Annotated[ExpiringReportPage, Query()],
+    session: ReadSession,
+    current_user: CurrentUser,
+):
+    """Live products expiring within `days`, expired ones included.
+
+    NDJSON in (expiration_date, id) order; pass the last line's values as
+    `after_expiration` and `after_id` to get the next page.
+    """
+    _require_admin(current_user)
+
+    query = _report_query(
+        page,
+        (Product.expiration_date, Product.id),
+        (page.after_expiration, page.after_id),
+    ).where(Product.expiration_date < datetime.now() + timedelta(page.days))
+
+    return _ndjson(session, query)
+
+
+@router.get('/reports/low-stock')
+async def low_stock_report(
+    page: Annotated[LowStockReportPage, Query()],
+    session: ReadSession,
+    current_user: CurrentUser,
+):
+    """Live products with stock below `threshold`.
+
+    NDJSON in (stock, id) order; pass the last line's values as
+    `after_stock` and `after_id` to get the next page.
+    """
+    _require_admin(current_user)
+
+    query = _report_query(
+        page,
+        (Product.stock, Product.id),
+        (page.after_stock, page.after_id),
+    ).where(Product.stock < page.threshold)
+
+    return _ndjson(session, query)
+
+
+@router.patch('/stock', response_model=StockBatchResult)
+async def change_stock_batch(
+    batch: StockBatch,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    """Apply many stock changes at once; items fail one by one.
+
+    Each item names a product by `id` or `barcode` and gives a `delta` or
+    an absolute `stock`. Items that would take stock below zero, or whose
+    product does not exist, are listed in `failed` by their position in
+    the batch; the rest are applied.
+    """
+    _require_admin(current_user)
+
+    outcome = await adjust_stock(session, batch.items)
+    await session.commit()
+    if outcome.sections:
+        await invalidate_sections(cache, *outcome.sections)
+
+    return {'updated': outcome.updated, 'failed': outcome.failed}
+
+
+@router.get('/{product_id}', response_model=ProductPublic)
+async def get_product(request: Request, product_id: int, session: ReadSession):
+    product = await _get_live_product(session, product_id)
+
+    return conditional_response(
+        request,
+        [product],
+        lambda: ProductPublic.model_validate(product).model_dump(mode='json'),
+    )
+
+
+@router.put('/{product_id}', response_model=ProductPublic)
+async def update_product(
+    product_id: int,
+    product: ProductSchema,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    _require_admin(current_user)
+
+    db_product = await _get_live_product(session, product_id)
+    previous_section = db_product.section
+
+    for field, value in product.model_dump().items():
+        setattr(db_product, field, value)
+    db_product.section = Section(product.section)
+    db_product.update()
+    await session.commit()
+
+    await invalidate_sections(cache, previous_section, db_product.section)
+
+    return db_product
+
+
+@router.patch('/{product_id}/stock', response_model=ProductPublic)
+async def change_stock(
+    product_id: int,
+    change: StockChange,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    """Add `delta` (negative to remove) to the stock in one statement."""
+    _require_admin(current_user)
+
+    db_product = await session.scalar(
+        update(Product)
+        .where(
+            Product.id == product_id,
+            Product.is_deleted == False,  # noqa
+            Product.stock + change.delta >= 0,
+        )
+        .values(
+            stock=Product.stock + change.delta,
+            updated_at=datetime.now(),
+            is_updated=True,
+        )
+        .returning(Product)
+        .execution_options(populate_existing=True)
+    )
+
+    if not db_product:
+        await _get_live_product(session, product_id)
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT, detail='Insufficient stock'
+        )
+
+    await session.commit()
+    await invalidate_sections(cache, db_product.section)
+
+    return db_product
+
+
+@router.delete('/{product_id}', response_model=Message)
+async def delete_product(
+    product_id: int,
+    session: Session,
+    current_user: CurrentUser,
+    cache: Cache,
+):
+    _require_admin(current_user)
+
+    db_product = await _get_live_product(session, product_id)
+    db_product.soft_delete()
+    await session.commit()
+
+    await invalidate_sections(cache, db_product.section)
+
+    return {'message': 'Product deleted'}
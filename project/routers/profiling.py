@@ -0,0 +1,57 @@
+import asyncio
+from http import HTTPStatus
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from project.models.base import Admin, User
+from project.profiler import profile_for
+from project.security import get_current_user
+
+router = APIRouter(
+    prefix='/admin',
+    tags=['admins'],
+    responses={404: {'description': 'Not found'}},
+)
+
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+# One profile at a time per worker: overlapping samplers would only
+# measure each other.
+_running = asyncio.Lock()
+
+
+@router.get('/profile')
+async def profile(
+    current_user: CurrentUser,
+    seconds: Annotated[float, Query(gt=0, le=60)] = 5,
+    mode: Literal['cpu', 'wall'] = 'cpu',
+    format: Literal['collapsed', 'speedscope'] = 'collapsed',
+    interval: Annotated[float, Query(ge=0.001, le=1)] = 0.005,
+):
+    """Sample this worker for `seconds` and return the stacks seen.
+
+    `cpu` shows what threads execute; `wall` shows where every asyncio
+    task is, awaits included. `collapsed` output feeds flamegraph.pl or
+    speedscope directly; `speedscope` is speedscope's JSON format.
+    """
+    if not isinstance(current_user, Admin):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Not enough permissions',
+        )
+
+    if _running.locked():
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail='A profile is already running',
+        )
+
+    async with _running:
+        result = await profile_for(seconds, mode, interval)
+
+    if format == 'speedscope':
+        return result.speedscope()
+
+    return PlainTextResponse(result.collapsed())
@@ -1,13 +1,23 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import and_, or_, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from sqlalchemy import and_, cast, exists, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..counts import count
+from ..database import get_db, get_read_db
+from ..http_cache import conditional_response
+from ..idempotency import (
+    IdempotencyStore,
+    fingerprint,
+    get_idempotency_store,
+    run_idempotent,
+)
 from ..models.base import Admin, Client, Role, User
+from ..refresh_tokens import revoke_subject
 from ..schemas.others import Message
 from ..schemas.users import (
     AdminSchemaCreate,
@@ -17,10 +27,12 @@ from ..schemas.users import (
     UserSchemaCreate,
     UserSchemaUpdate,
 )
-from ..security import get_current_user, get_password_hash
+from ..security import get_current_user, get_password_hash, hash_pool
 
 Session = Annotated[AsyncSession, Depends(get_db)]
+ReadSession = Annotated[AsyncSession, Depends(get_read_db)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
+Idempotency = Annotated[IdempotencyStore, Depends(get_idempotency_store)]
 
 client_router = APIRouter(
     prefix='/client',
@@ -34,6 +46,64 @@ admin_router = APIRouter(
 )
 
 
+def _conflict(field: str) -> HTTPException:
+    detail = (
+        'Email already exists' if field == 'email' else 'CPF already exists'
+    )
+
+    return HTTPException(status_code=HTTPStatus.CONFLICT, detail=detail)
+
+
+async def _insert_user(session, model, user, hashed_password: str):
+    """Insert a client or admin in a single INSERT ... SELECT ... RETURNING.
+
+    ON CONFLICT DO NOTHING covers duplicates in the target table and the
+    NOT EXISTS guard covers the other concrete table, so the happy path
+    costs exactly one statement and no refresh. Only a conflict pays for
+    another query, to tell which field collided.
+    """
+    other = Admin if model is Client else Client
+    table = model.__table__
+    values = {
+        'name': user.name,
+        'email': user.email,
+        'cpf': user.cpf,
+        'password': hashed_password,
+        'role': Role.CLIENT if model is Client else Role.ADMIN,
+        'is_deleted': False,
+        'is_updated': False,
+    }
+    duplicate = or_(other.email == user.email, other.cpf == user.cpf)
+    source = select(
+        *(
+            cast(literal(value), table.c[name].type)
+            for name, value in values.items()
+        )
+    ).where(~exists().where(duplicate))
+    stmt = (
+        insert(table)
+        .from_select(list(values), source)
+        .on_conflict_do_nothing()
+        .returning(*table.c)
+    )
+
+    db_user = await session.scalar(select(model).from_statement(stmt))
+
+    if db_user is None:
+        existing = await session.scalar(
+            select(User).where(
+                or_(User.email == user.email, User.cpf == user.cpf)
+            )
+        )
+        field = 'cpf' if existing and existing.email != user.email else 'email'
+        await session.rollback()
+        raise _conflict(field)
+
+    await session.commit()
+
+    return db_user
+
+
 @admin_router.post(
     '/', response_model=UserPublic, status_code=HTTPStatus.CREATED
 )
@@ -54,49 +124,71 @@ async def create_user(
             detail='Role does not exist',
         )
 
-    db_user = await session.scalar(
-        select(User).where(or_(User.email == user.email, User.cpf == user.cpf))
+    hashed_password = await hash_pool.run(get_password_hash, user.password)
+    model = Admin if user.role == Role.ADMIN.value else Client
+
+    db_user = await _insert_user(session, model, user, hashed_password)
+
+    return db_user
+
+
+USER_MODELS = {'admin': Admin, 'client': Client}
+
+
+def _text_filter(column, value: str, match: str, fold_case: bool = True):
+    if match == 'exact':
+        return column == value
+
+    if fold_case:
+        column, value = func.lower(column), value.lower()
+    escaped = (
+        value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
     )
+    pattern = f'{escaped}%' if match == 'prefix' else f'%{escaped}%'
+
+    return column.like(pattern, escape='\\')
 
-    if db_user:
-        if db_user.email == user.email:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Email already exists',
-            )
-        if db_user.cpf == user.cpf:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT, detail='CPF already exists'
-            )
 
-    hashed_password = get_password_hash(user.password)
+def users_query(filters: UserFilterPage):
+    """Active users matching `filters`, one page of them.
 
-    if user.role == Role.ADMIN.value:
-        db_user = Admin(
-            name=user.name,
-            email=user.email,
-            cpf=user.cpf,
-            password=hashed_password,
+    A role filter selects from that role's table alone instead of the
+    union of both. See docs/user-filters.md for the plan of each filter.
+    """
+    model = USER_MODELS.get(filters.role, User)
+    query = select(model).where(model.is_deleted == False)  # noqa
+
+    if filters.email:
+        query = query.where(
+            _text_filter(model.email, filters.email, filters.match)
         )
-    elif user.role == Role.CLIENT.value:
-        db_user = Client(
-            name=user.name,
-            email=user.email,
-            cpf=user.cpf,
-            password=hashed_password,
+
+    if filters.name:
+        query = query.where(
+            _text_filter(model.name, filters.name, filters.match)
         )
 
-    session.add(db_user)
-    await session.commit()
-    await session.refresh(db_user)
+    if filters.cpf:
+        digits = filters.cpf.replace('.', '').replace('-', '')
+        query = query.where(
+            _text_filter(model.cpf, digits, filters.match, fold_case=False)
+        )
 
-    return db_user
+    if filters.created_from:
+        query = query.where(model.created_at >= filters.created_from)
 
+    if filters.created_to:
+        query = query.where(model.created_at < filters.created_to)
 
-@admin_router.get('/', response_model=UserList)
+    return query.offset(filters.offset).limit(filters.limit)
+
+
+@admin_router.get(
+    '/', response_model=UserList, response_model_exclude_none=True
+)
 async def get_users(
     filter_users: Annotated[UserFilterPage, Query()],
-    session: Session,
+    session: ReadSession,
     current_user: CurrentUser,
 ):
     if not isinstance(current_user, Admin):
@@ -105,20 +197,16 @@ async def get_users(
             detail='Not enough permissions',
         )
 
-    query = select(User).where(User.is_deleted == False)  # noqa
-
-    if filter_users.email:
-        query = query.filter(User.email == filter_users.email)
-
-    if filter_users.name:
-        query = query.filter(User.name == filter_users.name)
-
-    query = query.offset(filter_users.offset).limit(filter_users.limit)
-
+    query = users_query(filter_users)
     result = await session.scalars(query)
     users = result.all()
 
-    return {'users': users}
+    if filter_users.count is None:
+        return {'users': users}
+
+    total, exact = await count(session, query, filter_users.count)
+
+    return {'users': users, 'total': total, 'total_exact': exact}
 
 
 @admin_router.delete('/{user_id}', response_model=Message)
@@ -155,6 +243,7 @@ async def delete_user(
         )
 
     user.soft_delete()
+    await revoke_subject(session, user.email)
     await session.commit()
 
     return {'message': 'User deleted'}
@@ -163,36 +252,47 @@ async def delete_user(
 @client_router.post(
     '/', status_code=HTTPStatus.CREATED, response_model=UserPublic
 )
-async def create_client(user: UserSchemaCreate, session: Session):
-    db_user = await session.scalar(
-        select(User).where(or_(User.email == user.email, User.cpf == user.cpf))
-    )
+async def create_client(
+    user: UserSchemaCreate,
+    session: Session,
+    store: Idempotency,
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
+):
+    async def create():
+        hashed_password = await hash_pool.run(get_password_hash, user.password)
+        db_user = await _insert_user(session, Client, user, hashed_password)
 
-    if db_user:
-        if db_user.email == user.email:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Email already exists',
-            )
-        if db_user.cpf == user.cpf:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT, detail='CPF already exists'
-            )
+        return UserPublic.model_validate(db_user).model_dump(mode='json')
 
-    hashed_password = get_password_hash(user.password)
+    if idempotency_key is None:
+        return await create()
 
-    db_user = Client(
-        name=user.name,
-        email=user.email,
-        cpf=user.cpf,
-        password=hashed_password,
+    return await run_idempotent(
+        store,
+        f'POST /client/:{idempotency_key}',
+        fingerprint(user.model_dump_json()),
+        create,
+        HTTPStatus.CREATED,
     )
 
-    session.add(db_user)
-    await session.commit()
-    await session.refresh(db_user)
 
-    return db_user
+@client_router.get('/{user_id}', response_model=UserPublic)
+async def get_client(
+    request: Request, user_id: int, current_user: CurrentUser
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail='Not enough permissions',
+        )
+
+    return conditional_response(
+        request,
+        [current_user],
+        lambda: UserPublic.model_validate(current_user).model_dump(
+            mode='json'
+        ),
+    )
 
 
 @client_router.put('/{user_id}', response_model=UserPublic)
@@ -208,24 +308,32 @@ async def update_client(
             detail='Not enough permissions',
         )
 
-    try:
-        current_user.name = user.name
-        current_user.email = user.email
+    if user.email != current_user.email:
+        # Refresh tokens are keyed by email; left alone they would mint
+        # tokens for whoever signs up with the old address next.
+        await revoke_subject(session, current_user.email)
 
-        if user.password:
-            current_user.password = get_password_hash(user.password)
+    current_user.name = user.name
+    current_user.email = user.email
 
-        await session.commit()
-        await session.refresh(current_user)
+    if user.password:
+        current_user.password = await hash_pool.run(
+            get_password_hash, user.password
+        )
 
-        return current_user
+    current_user.update()
 
+    try:
+        await session.commit()
     except IntegrityError:
+        await session.rollback()
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='Email already exists',
         )
 
+    return current_user
+
 
 @client_router.delete('/{user_id}', response_model=Message)
 async def delete_client(
@@ -243,6 +351,7 @@ async def delete_client(
         )
 
     current_user.soft_delete()
+    await revoke_subject(session, current_user.email)
     await session.commit()
 
     return {'message': 'User deleted'}
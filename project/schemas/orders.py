@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class OrderItem(BaseModel):
+    product_id: int
+    quantity: int = Field(1, ge=1)
+
+
+class OrderSchema(BaseModel):
+    items: List[OrderItem] = Field(min_length=1, max_length=1000)
+
+
+class OrderPublic(BaseModel):
+    id: int
+    client_id: int
+    total: float
+    status: str
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OrderList(BaseModel):
+    orders: List[OrderPublic]
+
+
+class PendingOrderPage(BaseModel):
+    limit: int = Field(100, ge=1, le=1000)
+    # Keyset cursor: the last order of the previous page.
+    after_created: datetime | None = None
+    after_id: int | None = None
@@ -1,39 +1,94 @@
-# from http import HTTPStatus
-# from typing import List
+from datetime import datetime
+from typing import List, Literal
 
-# from fastapi import HTTPException
-# from pydantic import BaseModel, ConfigDict, field_validator
-# from validate_docbr import CPF
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from .others import FilterPage
 
-# class ProductSchema(BaseModel):
-#     name: str
 
+class ProductPublic(BaseModel):
+    id: int
+    name: str
+    description: str
+    price: float
+    barcode: str
+    section: str
+    stock: int
+    expiration_date: datetime
+    model_config = ConfigDict(from_attributes=True)
 
-# class UserSchemaCreate(UserSchema):
-#     cpf: str
-#     password: str
 
-#     @field_validator('cpf', mode='before')
-#     @classmethod
-#     def cpf_validation(cls, value: str) -> str:
-#         cpf = CPF()
-#         if not cpf.validate(value):
-#             raise HTTPException(
-#                 status_code=HTTPStatus.BAD_REQUEST, detail='Invalid CPF'
-#             )
-#         return value
+class ProductList(BaseModel):
+    products: List[ProductPublic]
 
 
-# class UserSchemaUpdate(UserSchema):
-#     password: str | None = None
+class ProductFilterPage(FilterPage):
+    section: Literal['higiene', 'alimentacao', 'vestuario'] | None = None
 
 
-# class UserPublic(UserSchema):
-#     id: int
-#     cpf: str
-#     model_config = ConfigDict(from_attributes=True)
+class ProductSchema(BaseModel):
+    name: str
+    description: str
+    price: float = Field(ge=0)
+    barcode: str = Field(max_length=12)
+    section: Literal['higiene', 'alimentacao', 'vestuario']
+    stock: int = Field(ge=0)
+    expiration_date: datetime
 
 
-# class UserList(BaseModel):
-#     users: List[UserPublic]
+class StockChange(BaseModel):
+    delta: int
+
+
+class ReportPage(BaseModel):
+    section: Literal['higiene', 'alimentacao', 'vestuario'] | None = None
+    limit: int = Field(1000, ge=1, le=10_000)
+    # Keyset cursor: the last row of the previous page.
+    after_id: int | None = None
+
+
+class ExpiringReportPage(ReportPage):
+    days: int = Field(7, ge=0, le=365)
+    after_expiration: datetime | None = None
+
+
+class LowStockReportPage(ReportPage):
+    threshold: int = Field(5, ge=0)
+    after_stock: int | None = None
+
+
+class StockAdjustment(BaseModel):
+    """One product, by `id` or `barcode`, and a `delta` or new `stock`."""
+
+    id: int | None = None
+    barcode: str | None = Field(None, max_length=12)
+    delta: int | None = None
+    stock: int | None = Field(None, ge=0)
+
+    @model_validator(mode='after')
+    def one_target_and_one_change(self):
+        if (self.id is None) == (self.barcode is None):
+            raise ValueError('Give exactly one of id or barcode')
+        if (self.delta is None) == (self.stock is None):
+            raise ValueError('Give exactly one of delta or stock')
+        return self
+
+
+class StockBatch(BaseModel):
+    items: List[StockAdjustment] = Field(max_length=10_000)
+
+
+class StockAdjusted(BaseModel):
+    index: int
+    id: int
+    stock: int
+
+
+class StockFailure(BaseModel):
+    index: int
+    detail: str
+
+
+class StockBatchResult(BaseModel):
+    updated: List[StockAdjusted]
+    failed: List[StockFailure]
@@ -1,9 +1,9 @@
-from http import HTTPStatus
-from typing import List
+from datetime import datetime
+from typing import List, Literal
 
-from fastapi import HTTPException
 from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
-from validate_docbr import CPF
+
+from project.utils.cpf import validate as validate_cpf
 
 from .others import FilterPage
 
@@ -19,6 +19,11 @@ class AdminSchemaCreate(AdminSchema):
     password: str
     role: str
 
+    @field_validator('cpf', mode='before')
+    @classmethod
+    def cpf_validation(cls, value: str) -> str:
+        return validate_cpf(value)
+
 
 class UserSchema(BaseModel):
     name: str
@@ -27,7 +32,15 @@ class UserSchema(BaseModel):
 
 class UserFilterPage(FilterPage):
     name: str | None = None
-    email: EmailStr | None = None
+    email: str | None = None
+    cpf: str | None = None
+    # `exact` is case-sensitive; `prefix` and `contains` ignore case.
+    match: Literal['exact', 'prefix', 'contains'] = 'exact'
+    role: Literal['admin', 'client'] | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    # Adds `total` to the response; see project/counts.py.
+    count: Literal['exact', 'estimate', 'auto'] | None = None
 
 
 class UserSchemaCreate(UserSchema):
@@ -37,12 +50,7 @@ class UserSchemaCreate(UserSchema):
     @field_validator('cpf', mode='before')
     @classmethod
     def cpf_validation(cls, value: str) -> str:
-        cpf = CPF()
-        if not cpf.validate(value):
-            raise HTTPException(
-                status_code=HTTPStatus.BAD_REQUEST, detail='Invalid CPF'
-            )
-        return value
+        return validate_cpf(value)
 
 
 class UserSchemaUpdate(UserSchema):
@@ -58,3 +66,5 @@ class UserPublic(UserSchema):
 
 class UserList(BaseModel):
     users: List[UserPublic]
+    total: int | None = None
+    total_exact: bool | None = None
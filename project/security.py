@@ -1,22 +1,29 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import cache
 from http import HTTPStatus
 from typing import Annotated
 from zoneinfo import ZoneInfo
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jwt import DecodeError, ExpiredSignatureError, decode, encode
+from jwt import InvalidTokenError
 from pwdlib import PasswordHash
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from project.config import settings
 from project.database import get_db
+from project.keys import get_keyring
 from project.models.base import User
-
-password_context = PasswordHash.recommended()
+from project.revocation import revocations
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/token')
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl='/auth/token', auto_error=False
+)
 Session = Annotated[AsyncSession, Depends(get_db)]
 
 
@@ -25,21 +32,53 @@ def create_access_token(data: dict):
     expire = datetime.now(tz=ZoneInfo('UTC')) + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode.update({'exp': expire})
+    to_encode.update({'exp': expire, 'jti': uuid.uuid4().hex})
 
-    encoded_jwt = encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    return get_keyring().sign(to_encode)
+
+
+@cache
+def password_context() -> PasswordHash:
+    return PasswordHash.recommended()
 
-    return encoded_jwt
+
+class HashPool:
+    """Runs Argon2 off the event loop on a bounded pool of threads.
+
+    argon2 releases the GIL, so hashes run in parallel without stalling
+    other requests; `queued` is how many are waiting for a free thread.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='argon2'
+        )
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.pending - self.workers)
+
+    async def run(self, fn, *args):
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+        finally:
+            self.pending -= 1
+
+
+hash_pool = HashPool(settings.PASSWORD_HASH_WORKERS)
 
 
 def get_password_hash(password: str):
-    return password_context.hash(password)
+    return password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    return password_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 async def get_current_user(
@@ -52,16 +91,17 @@ async def get_current_user(
     )
 
     try:
-        payload = decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = get_keyring().verify(token)
         subject_email = payload.get('sub')
 
         if not subject_email:
             raise credentials_exception
-    except DecodeError:
+    except InvalidTokenError:
         raise credentials_exception
-    except ExpiredSignatureError:
+
+    if revocations.due:
+        await revocations.refresh(session)
+    if payload.get('jti') in revocations:
         raise credentials_exception
 
     user = await session.scalar(
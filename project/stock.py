@@ -0,0 +1,259 @@
+"""Set-based stock changes.
+
+A batch is applied with one `UPDATE products ... FROM (VALUES ...)` per
+chunk instead of a statement per product. The stock check is part of the
+UPDATE's WHERE clause, so an adjustment that would take stock below zero
+skips that row and is reported, instead of violating
+`check_stock_gte_zero` and aborting the whole statement.
+
+The UPDATEs lock rows in whatever order the plan visits them, so two
+transactions touching overlapping products could each hold a row the
+other waits for. Every change locks its products in id order first.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    case,
+    column,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.config import settings
+from project.models.base import (
+    Product,
+    Section,
+    order_products_association_table,
+)
+from project.schemas.products import StockAdjustment
+
+
+@dataclass
+class StockBatchOutcome:
+    updated: list[dict] = field(default_factory=list)
+    failed: list[dict] = field(default_factory=list)
+    sections: set[Section] = field(default_factory=set)
+
+    def fail(self, index: int, detail: str):
+        self.failed.append({'index': index, 'detail': detail})
+
+
+async def _ids_by_barcode(
+    session: AsyncSession, barcodes: set[str]
+) -> dict[str, list[int]]:
+    ids = defaultdict(list)
+    if barcodes:
+        rows = await session.execute(
+            select(Product.barcode, Product.id).where(
+                Product.barcode.in_(barcodes),
+                Product.is_deleted == False,  # noqa
+            )
+        )
+        for barcode, product_id in rows:
+            ids[barcode].append(product_id)
+
+    return ids
+
+
+async def _lock_products(session: AsyncSession, ids):
+    """Lock the products in `ids` (a list or a subquery) in id order."""
+    await session.execute(
+        select(Product.id)
+        .where(Product.id.in_(ids))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+
+
+async def _apply_chunk(
+    session: AsyncSession,
+    rows: list[tuple[int, int, int, bool]],
+    outcome: StockBatchOutcome,
+):
+    """Apply (index, product id, amount, absolute) rows in one statement."""
+    await _lock_products(session, [row[1] for row in rows])
+    adjustments = values(
+        column('index', Integer),
+        column('product_id', Integer),
+        column('amount', Integer),
+        column('absolute', Boolean),
+        name='adjustments',
+    ).data(rows)
+    new_stock = case(
+        (adjustments.c.absolute, adjustments.c.amount),
+        else_=Product.stock + adjustments.c.amount,
+    )
+    result = await session.execute(
+        update(Product)
+        .where(
+            Product.id == adjustments.c.product_id,
+            Product.is_deleted == False,  # noqa
+            new_stock >= 0,
+        )
+        .values(stock=new_stock, updated_at=datetime.now(), is_updated=True)
+        .returning(
+            adjustments.c.index, Product.id, Product.stock, Product.section
+        )
+    )
+
+    applied = set()
+    for index, product_id, stock, section in result:
+        applied.add(index)
+        outcome.updated.append({
+            'index': index,
+            'id': product_id,
+            'stock': stock,
+        })
+        outcome.sections.add(section)
+
+    missed = {row[1]: row[0] for row in rows if row[0] not in applied}
+    if not missed:
+        return
+    live = set(
+        await session.scalars(
+            select(Product.id).where(
+                Product.id.in_(missed),
+                Product.is_deleted == False,  # noqa
+            )
+        )
+    )
+    for product_id, index in missed.items():
+        outcome.fail(
+            index,
+            'Insufficient stock'
+            if product_id in live
+            else 'Product not found',
+        )
+
+
+async def adjust_stock(
+    session: AsyncSession,
+    items: list[StockAdjustment],
+    chunk_size: int = settings.STOCK_BATCH_CHUNK_SIZE,
+) -> StockBatchOutcome:
+    """Apply a batch of stock adjustments; the caller commits.
+
+    Barcodes are resolved to ids first (they are not unique), and each
+    product may appear once per batch, since an UPDATE ... FROM changes a
+    row once however many VALUES rows join it.
+    """
+    outcome = StockBatchOutcome()
+    by_barcode = await _ids_by_barcode(
+        session, {item.barcode for item in items if item.barcode is not None}
+    )
+
+    rows = []
+    seen = set()
+    for index, item in enumerate(items):
+        product_id = item.id
+        if product_id is None:
+            matches = by_barcode.get(item.barcode, [])
+            if len(matches) != 1:
+                outcome.fail(
+                    index,
+                    'Ambiguous barcode' if matches else 'Product not found',
+                )
+                continue
+            product_id = matches[0]
+        if product_id in seen:
+            outcome.fail(index, 'Duplicate product in batch')
+            continue
+        seen.add(product_id)
+
+        absolute = item.stock is not None
+        rows.append((
+            index,
+            product_id,
+            item.stock if absolute else item.delta,
+            absolute,
+        ))
+
+    # Chunks in id order keep the locks in id order across the whole batch.
+    rows.sort(key=lambda row: row[1])
+    for start in range(0, len(rows), chunk_size):
+        await _apply_chunk(session, rows[start : start + chunk_size], outcome)
+
+    outcome.updated.sort(key=lambda row: row['index'])
+    outcome.failed.sort(key=lambda row: row['index'])
+
+    return outcome
+
+
+async def reserve(
+    session: AsyncSession, quantities: dict[int, int]
+) -> list[tuple[int, float, Section]] | None:
+    """Take `quantities` (product id -> units) out of stock in one statement.
+
+    Returns (id, price, section) of each product, or None when a product
+    is missing or short; the caller then rolls back, since the other
+    products were taken already. The caller commits.
+    """
+    await _lock_products(session, list(quantities))
+    wanted = values(
+        column('product_id', Integer),
+        column('quantity', Integer),
+        name='wanted',
+    ).data(list(quantities.items()))
+    rows = (
+        await session.execute(
+            update(Product)
+            .where(
+                Product.id == wanted.c.product_id,
+                Product.is_deleted == False,  # noqa
+                Product.stock >= wanted.c.quantity,
+            )
+            .values(
+                stock=Product.stock - wanted.c.quantity,
+                updated_at=datetime.now(),
+                is_updated=True,
+            )
+            .returning(Product.id, Product.price, Product.section)
+        )
+    ).all()
+
+    return rows if len(rows) == len(quantities) else None
+
+
+async def restock(session: AsyncSession, order_ids) -> tuple[int, set]:
+    """Return the units of `order_ids` to stock in one statement.
+
+    `order_ids` is a list or a subquery of order ids. Returns the units
+    returned and the sections of the products that got them back. The
+    caller commits.
+    """
+    items = order_products_association_table.c
+    await _lock_products(
+        session,
+        select(items.product_id).where(items.order_id.in_(order_ids)),
+    )
+    returned = (
+        select(
+            items.product_id,
+            func.sum(items.quantity).label('quantity'),
+        )
+        .where(items.order_id.in_(order_ids))
+        .group_by(items.product_id)
+        .subquery('returned')
+    )
+    rows = (
+        await session.execute(
+            update(Product)
+            .where(Product.id == returned.c.product_id)
+            .values(
+                stock=Product.stock + returned.c.quantity,
+                updated_at=datetime.now(),
+                is_updated=True,
+            )
+            .returning(returned.c.quantity, Product.section)
+        )
+    ).all()
+
+    return sum(quantity for quantity, _ in rows), {s for _, s in rows}
@@ -0,0 +1,78 @@
+"""CPF normalization and check-digit validation.
+
+Validation works on the ASCII bytes of the bare digits. Every byte carries
+an extra ord('0'), so the weighted sums are taken straight from the bytes
+and the precomputed excess is subtracted once, instead of calling int() on
+each character. The second sum is derived from the first: its weights are
+the first ones plus one, so it only adds the plain sum of the digits.
+"""
+
+from operator import mul
+from typing import Iterable
+
+from pydantic_core import PydanticCustomError
+
+LENGTH = 11
+
+_ZERO = ord('0')
+_WEIGHTS = bytes(range(10, 1, -1))
+_WEIGHTED_EXCESS = _ZERO * sum(_WEIGHTS)
+_PLAIN_EXCESS = _ZERO * len(_WEIGHTS)
+_REPEATED = frozenset(str(digit) * LENGTH for digit in range(10))
+
+
+def _check_digit(total: int) -> int:
+    # (total * 10) % 11 is in 0..10, and a result of 10 means 0.
+    return total * 10 % 11 % 10
+
+
+def normalize(value: str) -> str | None:
+    """Return the 11 bare digits of a valid CPF, or None if it is invalid.
+
+    Accepts the same input as validate_docbr: digits optionally separated
+    by '.' and '-' (e.g. '529.982.247-25').
+    """
+    if not isinstance(value, str):
+        return None
+
+    digits = value.strip().replace('.', '').replace('-', '')
+    if (
+        len(digits) != LENGTH
+        or not digits.isascii()
+        or not digits.isdigit()
+        or digits in _REPEATED
+    ):
+        return None
+
+    raw = digits.encode()
+    total = sum(map(mul, raw, _WEIGHTS)) - _WEIGHTED_EXCESS
+    first = _check_digit(total)
+    if raw[9] - _ZERO != first:
+        return None
+
+    total += sum(raw[:9]) - _PLAIN_EXCESS + 2 * first
+    if raw[10] - _ZERO != _check_digit(total):
+        return None
+
+    return digits
+
+
+def is_valid(value: str) -> bool:
+    return normalize(value) is not None
+
+
+def normalize_many(values: Iterable[str]) -> list[str | None]:
+    """Normalize a batch of CPFs, e.g. from an import.
+
+    The result is aligned with the input; invalid entries are None.
+    """
+    return list(map(normalize, values))
+
+
+def validate(value: str) -> str:
+    """Pydantic validator: normalized CPF or a 'cpf' validation error."""
+    digits = normalize(value)
+    if digits is None:
+        raise PydanticCustomError('cpf', 'Invalid CPF')
+
+    return digits
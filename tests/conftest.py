@@ -1,5 +1,9 @@
 # ruff: noqa: E402
+import json
+import time
+from collections import defaultdict
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import factory
@@ -8,31 +12,171 @@ import pytest_asyncio
 from fastapi.testclient import TestClient
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.routing import Match
 from testcontainers.postgres import PostgresContainer
 from validate_docbr import CPF
 
-from project.database import get_db
-from project.main import app
-from project.models.base import Admin, Base, Client, Role
+from project.database import get_db, get_read_db
+from project.main import app, create_app
+from project.models.base import (
+    Admin,
+    Base,
+    Client,
+    Product,
+    Role,
+    Section,
+    configure_models,
+)
+from project.response_cache import (
+    MemoryCacheBackend,
+    ResponseCache,
+    get_response_cache,
+)
 from project.security import get_password_hash
 
 
+@dataclass
+class StatementRecorder:
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    @property
+    def duration(self):
+        return sum(seconds for _, seconds in self.statements)
+
+    @property
+    def sql(self):
+        return [statement for statement, _ in self.statements]
+
+
+_recorders: list[StatementRecorder] = []
+_endpoint_report = defaultdict(
+    lambda: {'requests': 0, 'statements': 0, 'max_statements': 0, 'db_ms': 0}
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, *args):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, *args):
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    for recorder in _recorders:
+        recorder.statements.append((statement, elapsed))
+
+
+def _endpoint(request):
+    scope = {
+        'type': 'http',
+        'path': request.url.path,
+        'method': request.method,
+    }
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f'{request.method} {route.path}'
+
+    return f'{request.method} {request.url.path}'
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--sql-report',
+        default=None,
+        help='write per-endpoint SQL statement counts and DB time as JSON',
+    )
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption('--sql-report', default=None)
+    if not path:
+        return
+
+    report = {
+        endpoint: {
+            **stats,
+            'db_ms': round(stats['db_ms'], 3),
+            'statements_per_request': round(
+                stats['statements'] / stats['requests'], 2
+            ),
+        }
+        for endpoint, stats in sorted(_endpoint_report.items())
+    }
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+
+
 @pytest.fixture
-def client(session):
+def sql_statements():
+    """Record the SQL statements issued inside a `with` block.
+
+    Usage: `with sql_statements() as recorded: client.post(...)`, then
+    assert on `recorded.count` (and print `recorded.sql` on failure).
+    """
+
+    @contextmanager
+    def record():
+        recorder = StatementRecorder()
+        _recorders.append(recorder)
+        try:
+            yield recorder
+        finally:
+            _recorders.remove(recorder)
+
+    return record
+
+
+@pytest.fixture
+def client(engine, session):
     def get_db_override():
         return session
 
-    with TestClient(app) as client:
-        app.dependency_overrides[get_db] = get_db_override
+    per_request = StatementRecorder()
+
+    def start_request(request):
+        per_request.statements.clear()
+        _recorders.append(per_request)
+
+    def finish_request(response):
+        _recorders.remove(per_request)
+        stats = _endpoint_report[_endpoint(response.request)]
+        stats['requests'] += 1
+        stats['statements'] += per_request.count
+        stats['max_statements'] = max(
+            stats['max_statements'], per_request.count
+        )
+        stats['db_ms'] += per_request.duration * 1000
+
+    test_app = create_app(engine=engine)
+    test_app.dependency_overrides[get_db] = get_db_override
+    test_app.dependency_overrides[get_read_db] = get_db_override
+    response_cache = ResponseCache(MemoryCacheBackend())
+    test_app.dependency_overrides[get_response_cache] = lambda: response_cache
+
+    with TestClient(test_app) as client:
+        client.event_hooks = {
+            'request': [start_request],
+            'response': [finish_request],
+        }
         yield client
 
-    app.dependency_overrides.clear()
-
 
 @pytest.fixture(scope='session')
 def engine():
+    configure_models()
     with PostgresContainer('postgres:17', driver='psycopg') as postgres:
         _engine = create_async_engine(postgres.get_connection_url())
+        event.listen(
+            _engine.sync_engine,
+            'before_cursor_execute',
+            _before_cursor_execute,
+        )
+        event.listen(
+            _engine.sync_engine, 'after_cursor_execute', _after_cursor_execute
+        )
         yield _engine
 
 
@@ -117,6 +261,17 @@ async def other_user(session):
     return user
 
 
+@pytest_asyncio.fixture
+async def product(session):
+    product = ProductFactory()
+
+    session.add(product)
+    await session.commit()
+    await session.refresh(product)
+
+    return product
+
+
 @pytest.fixture
 def token(client, user):
     response = client.post(
@@ -157,3 +312,16 @@ class AdminFactory(factory.Factory):
     email = factory.LazyAttribute(lambda obj: f'{obj.name}@teste.com')
     password = factory.LazyAttribute(lambda obj: f'{obj.name}@example.com')
     role = factory.Faker('role')
+
+
+class ProductFactory(factory.Factory):
+    class Meta:
+        model = Product
+
+    name = factory.Sequence(lambda n: f'product{n}')
+    description = factory.LazyAttribute(lambda obj: f'{obj.name} description')
+    price = 10.0
+    barcode = factory.Sequence(lambda n: f'{n:012d}')
+    section = Section.ALIMENTACAO
+    stock = 10
+    expiration_date = datetime(2030, 1, 1)
@@ -201,6 +201,129 @@ def test_admin_get_users_with_name_filter(client, admin_token, user):
     assert users[0]['name'] == user.name
 
 
+def test_admin_get_users_with_prefix_filter(client, admin_token, user):
+    """Prefix search ignores case."""
+    response = client.get(
+        '/admin/',
+        params={'name': user.name[:3].upper(), 'match': 'prefix'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    emails = {u['email'] for u in response.json()['users']}
+    assert user.email in emails
+
+
+def test_admin_get_users_with_contains_filter(
+    client, admin_token, user, other_user
+):
+    """Substring search on email."""
+    response = client.get(
+        '/admin/',
+        params={'email': user.email.split('@')[0][1:], 'match': 'contains'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    emails = [u['email'] for u in response.json()['users']]
+    assert emails == [user.email]
+
+
+def test_admin_get_users_like_wildcards_are_literal(client, admin_token, user):
+    response = client.get(
+        '/admin/',
+        params={'name': '%', 'match': 'contains'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'users': []}
+
+
+def test_admin_get_users_with_cpf_prefix(client, admin_token, user):
+    response = client.get(
+        '/admin/',
+        params={
+            'cpf': f'{user.cpf[:3]}.{user.cpf[3:6]}',
+            'match': 'prefix',
+        },
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    cpfs = {u['cpf'] for u in response.json()['users']}
+    assert user.cpf in cpfs
+
+
+def test_admin_get_users_with_role_filter(client, admin_token, admin, user):
+    response = client.get(
+        '/admin/',
+        params={'role': 'admin'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    users = response.json()['users']
+    assert [u['email'] for u in users] == [admin.email]
+
+
+def test_admin_get_users_with_created_range(client, admin_token, user):
+    headers = {'Authorization': f'Bearer {admin_token}'}
+
+    response = client.get(
+        '/admin/',
+        params={'created_from': '2000-01-01T00:00:00', 'role': 'client'},
+        headers=headers,
+    )
+    assert [u['email'] for u in response.json()['users']] == [user.email]
+
+    response = client.get(
+        '/admin/',
+        params={'created_to': '2000-01-01T00:00:00'},
+        headers=headers,
+    )
+    assert response.json() == {'users': []}
+
+
+def test_admin_get_users_exact_total(client, admin_token, user, other_user):
+    response = client.get(
+        '/admin/',
+        params={'role': 'client', 'limit': 1, 'count': 'exact'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    data = response.json()
+    assert len(data['users']) == 1
+    assert data['total'] == 2  # noqa: PLR2004
+    assert data['total_exact'] is True
+
+
+def test_admin_get_users_estimated_total(client, admin_token, user):
+    response = client.get(
+        '/admin/',
+        params={'count': 'estimate'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    data = response.json()
+    assert isinstance(data['total'], int)
+    assert data['total_exact'] is False
+
+
+def test_admin_get_users_auto_total_is_exact_when_small(
+    client, admin_token, user
+):
+    response = client.get(
+        '/admin/',
+        params={'count': 'auto', 'name': user.name},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    data = response.json()
+    assert data['total'] == 1
+    assert data['total_exact'] is True
+
+
 def test_admin_get_users_with_pagination(client, admin_token):
     """Test pagination parameters."""
     response = client.get(
@@ -0,0 +1,158 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from project.middleware import (
+    AdaptiveLimiter,
+    AdmissionControlMiddleware,
+    RouteBudget,
+)
+
+
+@pytest.fixture
+def slow_app():
+    app = FastAPI()
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        budgets={
+            ('GET', '/slow'): RouteBudget(limit=1, queue=1, timeout=0.05)
+        },
+        retry_after=2,
+    )
+
+    @app.get('/slow')
+    async def slow():
+        await asyncio.sleep(0.2)
+        return {}
+
+    @app.get('/cheap')
+    async def cheap():
+        return {}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_and_sheds():
+    limiter = AdaptiveLimiter(RouteBudget(limit=1, queue=1, timeout=1))
+
+    assert await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert limiter.queued == 1
+    assert not await limiter.acquire()
+    assert limiter.shed == 1
+
+    limiter.release(0.01)
+
+    assert await waiting
+    assert limiter.inflight == 1
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_after_queue_timeout():
+    limiter = AdaptiveLimiter(RouteBudget(limit=1, queue=5, timeout=0.01))
+
+    assert await limiter.acquire()
+    assert not await limiter.acquire()
+    assert limiter.queued == 0
+    assert limiter.shed == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_timeout_after_waiter_was_popped():
+    limiter = AdaptiveLimiter(RouteBudget(limit=1, queue=5, timeout=0))
+    assert await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # The waiter times out, and another request's release() runs before
+    # the waiting task resumes.
+    limiter.release(0.01)
+    granted = await waiting
+
+    assert limiter.queued == 0
+    assert limiter.inflight == (1 if granted else 0)
+
+
+@pytest.mark.asyncio
+async def test_limiter_returns_slot_of_cancelled_request():
+    limiter = AdaptiveLimiter(RouteBudget(limit=1, queue=5, timeout=1))
+    assert await limiter.acquire()
+    cancelled = asyncio.create_task(limiter.acquire())
+    next_in_line = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # The slot is handed over, then the client disconnects before the
+    # request resumes to use it.
+    limiter.release(0.01)
+    cancelled.cancel()
+    try:
+        granted = await cancelled
+    except asyncio.CancelledError:
+        granted = False
+    if granted:  # Python < 3.12 lets the request through instead.
+        limiter.release(0.01)
+
+    assert await next_in_line
+    assert limiter.inflight == 1
+    assert limiter.queued == 0
+
+
+def test_limiter_adapts_to_latency():
+    budget = RouteBudget(limit=10, queue=0, timeout=1, target_latency=0.1)
+    limiter = AdaptiveLimiter(budget)
+
+    for _ in range(10):
+        limiter.inflight += 1
+        limiter.release(0.5)
+    shrunk = limiter.limit
+
+    for _ in range(50):
+        limiter.inflight += 1
+        limiter.release(0.01)
+
+    assert shrunk < budget.limit
+    assert limiter.limit > shrunk
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_budgeted_route_only(slow_app):
+    transport = ASGITransport(app=slow_app)
+    async with AsyncClient(transport=transport, base_url='http://test') as ac:
+        slow = [asyncio.create_task(ac.get('/slow')) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        cheap = await ac.get('/cheap')
+        responses = await asyncio.gather(*slow)
+
+    statuses = sorted(response.status_code for response in responses)
+    shed = [
+        response
+        for response in responses
+        if response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    ]
+
+    assert cheap.status_code == HTTPStatus.OK
+    assert statuses[0] == HTTPStatus.OK
+    assert len(shed) == 2  # noqa: PLR2004
+    assert shed[0].headers['Retry-After'] == '2'
+
+
+def test_middleware_matches_longest_prefix():
+    middleware = AdmissionControlMiddleware(
+        None,
+        budgets={
+            ('POST', '/client'): RouteBudget(limit=1, queue=0, timeout=1),
+            ('*', '/client/special'): RouteBudget(limit=2, queue=0, timeout=1),
+        },
+    )
+
+    assert middleware.match('POST', '/client/').budget.limit == 1
+    assert middleware.match('POST', '/client/special/1').budget.limit == 2  # noqa: PLR2004
+    assert middleware.match('GET', '/client/1') is None
+    assert middleware.match('POST', '/clients') is None
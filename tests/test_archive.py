@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+from validate_docbr import CPF
+
+from project.commands.archive import archive_soft_deleted
+from project.models.base import (
+    Client,
+    Order,
+    Product,
+    Section,
+    clients_archive_table,
+    order_products_association_table,
+)
+
+
+async def _create_clients(session, deleted_days_ago):
+    clients = []
+    for index, days in enumerate(deleted_days_ago):
+        client = Client(
+            name=f'client{index}',
+            email=f'client{index}@teste.com',
+            cpf=CPF().generate(),
+            password='hash',
+        )
+        if days is not None:
+            client.soft_delete()
+            client.deleted_at = datetime.now() - timedelta(days=days)
+        clients.append(client)
+
+    session.add_all(clients)
+    await session.commit()
+
+    return clients
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_soft_deleted_rows(session):
+    await _create_clients(session, [None, 1, 40, 60, 90])
+
+    report = await archive_soft_deleted(
+        session, 'clients', older_than_days=30, batch_size=2, throttle=0
+    )
+
+    assert report.rows == 3  # noqa: PLR2004
+    assert report.batches == 2  # noqa: PLR2004
+
+    remaining = await session.scalars(select(Client.name).order_by(Client.id))
+    assert remaining.all() == ['client0', 'client1']
+
+    archived = await session.scalars(
+        select(clients_archive_table.c.name).order_by(
+            clients_archive_table.c.id
+        )
+    )
+    assert archived.all() == ['client2', 'client3', 'client4']
+
+
+@pytest.mark.asyncio
+async def test_archive_dry_run_changes_nothing(session):
+    await _create_clients(session, [None, 40, 60])
+
+    report = await archive_soft_deleted(
+        session, 'clients', older_than_days=30, dry_run=True, throttle=0
+    )
+
+    assert report.rows == 2  # noqa: PLR2004
+    assert await session.scalar(select(func.count(Client.id))) == 3  # noqa: PLR2004
+    assert (
+        await session.scalar(
+            select(func.count()).select_from(clients_archive_table)
+        )
+        == 0
+    )
+
+
+@pytest.mark.asyncio
+async def test_purge_keeps_rows_still_referenced(session):
+    (client,) = await _create_clients(session, [None])
+    products = [
+        Product(
+            name=f'product{index}',
+            description='desc',
+            price=1.0,
+            barcode=f'{index:012d}',
+            section=Section.HIGIENE,
+            stock=1,
+            expiration_date=datetime(2030, 1, 1),
+        )
+        for index in range(2)
+    ]
+    order = Order(client_id=client.id, client=client, products=[])
+    session.add_all([*products, order])
+    await session.flush()
+    await session.execute(
+        insert(order_products_association_table).values(
+            product_id=products[0].id, order_id=order.id
+        )
+    )
+    for product in products:
+        product.soft_delete()
+        product.deleted_at = datetime.now() - timedelta(days=60)
+    await session.commit()
+
+    report = await archive_soft_deleted(
+        session, 'products', mode='purge', throttle=0
+    )
+
+    assert report.rows == 1
+    remaining = await session.scalars(select(Product.name))
+    assert remaining.all() == ['product0']
+
+
+@pytest.mark.asyncio
+async def test_archive_invalid_mode(session):
+    with pytest.raises(ValueError, match='Invalid mode'):
+        await archive_soft_deleted(session, 'clients', mode='shred')
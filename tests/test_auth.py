@@ -151,3 +151,135 @@ def test_token_expired_dont_refresh(client, user):
         )
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def _login(client, user):
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    return response.json()
+
+
+def test_login_returns_refresh_token(client, user):
+    assert _login(client, user)['refresh_token']
+
+
+def test_refresh_token_rotates(client, user):
+    first = _login(client, user)['refresh_token']
+
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': first}
+    )
+
+    data = response.json()
+    assert response.status_code == HTTPStatus.OK
+    assert data['token_type'] == 'bearer'
+    assert data['refresh_token'] != first
+
+    response = client.post(
+        '/auth/refresh_token',
+        headers={'Authorization': f'Bearer {data["access_token"]}'},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_refresh_token_reuse_revokes_family(client, user):
+    first = _login(client, user)['refresh_token']
+    second = client.post(
+        '/auth/refresh_token', json={'refresh_token': first}
+    ).json()['refresh_token']
+
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': first}
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Refresh token reuse detected'}
+
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': second}
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Invalid refresh token'}
+
+
+def test_refresh_token_unknown(client):
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': 'nope'}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Invalid refresh token'}
+
+
+def test_refresh_token_expired(client, user):
+    with freeze_time('2025-01-01 12:00:00'):
+        refresh_token = _login(client, user)['refresh_token']
+
+    with freeze_time('2025-03-01 12:00:00'):
+        response = client.post(
+            '/auth/refresh_token', json={'refresh_token': refresh_token}
+        )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Invalid refresh token'}
+
+
+def test_delete_client_revokes_refresh_tokens(client, user):
+    login = _login(client, user)
+
+    client.delete(
+        f'/client/{user.id}',
+        headers={'Authorization': f'Bearer {login["access_token"]}'},
+    )
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': login['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_email_change_revokes_refresh_tokens(client, user):
+    login = _login(client, user)
+
+    response = client.put(
+        f'/client/{user.id}',
+        headers={'Authorization': f'Bearer {login["access_token"]}'},
+        json={'name': user.name, 'email': 'renamed@example.com'},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': login['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Invalid refresh token'}
+
+
+def test_logout_revokes_access_token(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+
+    response = client.post('/auth/logout', headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Logged out'}
+
+    response = client.post('/auth/refresh_token', headers=headers)
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_logout_revokes_refresh_token(client, user):
+    login = _login(client, user)
+
+    client.post(
+        '/auth/logout',
+        headers={'Authorization': f'Bearer {login["access_token"]}'},
+        json={'refresh_token': login['refresh_token']},
+    )
+    response = client.post(
+        '/auth/refresh_token', json={'refresh_token': login['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
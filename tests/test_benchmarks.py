@@ -0,0 +1,48 @@
+from benchmarks.load import SCENARIOS, compare, percentile
+from project.main import app
+
+
+def _result(p95, throughput):
+    return {
+        'scenarios': {
+            'token': {
+                'p50_ms': 10,
+                'p95_ms': p95,
+                'p99_ms': 30,
+                'throughput_rps': throughput,
+            }
+        }
+    }
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50  # noqa: PLR2004
+    assert percentile(values, 99) == 99  # noqa: PLR2004
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_regressions():
+    regressions = compare(_result(20, 100), _result(25, 80), threshold=0.1)
+
+    assert {(r['metric'], r['change']) for r in regressions} == {
+        ('p95_ms', 0.25),
+        ('throughput_rps', 0.2),
+    }
+
+
+def test_compare_ignores_changes_within_threshold():
+    assert not compare(_result(20, 100), _result(21, 95), threshold=0.1)
+
+
+def test_load_scenarios_target_existing_routes():
+    # run() skips scenarios whose route is missing, so a renamed route
+    # would silently drop out of the results.
+    routes = {
+        (method.upper(), path)
+        for path, operations in app.openapi()['paths'].items()
+        for method in operations
+    }
+
+    assert {(s.method, s.path) for s in SCENARIOS} <= routes
@@ -0,0 +1,21 @@
+from project.counts import CountCache
+
+
+def test_count_cache_expires_entries():
+    now = [0.0]
+    cache = CountCache(ttl=10, max_entries=10, clock=lambda: now[0])
+    cache.set(('exact', 'q', ()), 5, True)
+
+    assert cache.get(('exact', 'q', ())) == (5, True)
+
+    now[0] = 10.0
+    assert cache.get(('exact', 'q', ())) is None
+
+
+def test_count_cache_is_bounded():
+    cache = CountCache(ttl=10, max_entries=2)
+    for index in range(3):
+        cache.set(('exact', str(index), ()), index, True)
+
+    assert len(cache) == 2  # noqa: PLR2004
+    assert cache.get(('exact', '0', ())) is None
@@ -0,0 +1,47 @@
+import pytest
+from pydantic_core import PydanticCustomError
+from validate_docbr import CPF
+
+from project.utils import cpf
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [
+        ('52998224725', '52998224725'),
+        ('529.982.247-25', '52998224725'),
+        (' 529.982.247-25 ', '52998224725'),
+        ('52998224724', None),
+        ('11111111111', None),
+        ('5299822472', None),
+        ('529/982/247-25', None),
+        ('５２９９８２２４７２５', None),
+        (None, None),
+    ],
+)
+def test_normalize(value, expected):
+    assert cpf.normalize(value) == expected
+
+
+def test_matches_validate_docbr():
+    reference = CPF()
+    generated = [reference.generate() for _ in range(200)]
+    tampered = [
+        value[:-1] + str((int(value[-1]) + 1) % 10) for value in generated
+    ]
+
+    for value in generated + tampered:
+        assert cpf.is_valid(value) is reference.validate(value)
+
+
+def test_normalize_many_keeps_positions():
+    assert cpf.normalize_many(['529.982.247-25', 'x', '52998224725']) == [
+        '52998224725',
+        None,
+        '52998224725',
+    ]
+
+
+def test_validate_raises_validation_error():
+    with pytest.raises(PydanticCustomError):
+        cpf.validate('00000000000')
@@ -0,0 +1,169 @@
+import hashlib
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from validate_docbr import CPF
+
+from project.idempotency import (
+    REPLAYED_HEADER,
+    IdempotencyKeyEvictor,
+    MemoryIdempotencyStore,
+    PostgresIdempotencyStore,
+    StoredResponse,
+    fingerprint,
+    get_idempotency_store,
+)
+from project.routers import users
+from project.schemas.users import UserSchemaCreate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store(client):
+    store = MemoryIdempotencyStore()
+    client.app.dependency_overrides[get_idempotency_store] = lambda: store
+    return store
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+    original = users.get_password_hash
+
+    def counting_hash(password):
+        calls.append(password)
+        return original(password)
+
+    monkeypatch.setattr(users, 'get_password_hash', counting_hash)
+    return calls
+
+
+def _signup(client, key, **overrides):
+    payload = {
+        'name': 'alice',
+        'email': 'alice@example.com',
+        'cpf': '52998224725',
+        'password': 'senha',
+        **overrides,
+    }
+    return client.post(
+        '/client/', json=payload, headers={'Idempotency-Key': key}
+    )
+
+
+def test_retry_replays_response_without_hashing(client, store, hash_calls):
+    first = _signup(client, 'abc')
+    second = _signup(client, 'abc')
+
+    assert first.status_code == HTTPStatus.CREATED
+    assert second.status_code == HTTPStatus.CREATED
+    assert second.json() == first.json()
+    assert second.headers[REPLAYED_HEADER] == 'true'
+    assert len(hash_calls) == 1
+
+
+def test_conflict_is_replayed(client, store, hash_calls):
+    cpf = CPF().generate()
+    _signup(client, 'first')
+    conflict = _signup(client, 'second', cpf=cpf)
+    replay = _signup(client, 'second', cpf=cpf)
+
+    assert conflict.status_code == HTTPStatus.CONFLICT
+    assert replay.status_code == HTTPStatus.CONFLICT
+    assert replay.json() == {'detail': 'Email already exists'}
+    assert replay.headers[REPLAYED_HEADER] == 'true'
+    assert len(hash_calls) == 2  # noqa: PLR2004
+
+
+def test_key_reused_with_different_body(client, store):
+    _signup(client, 'abc')
+    response = _signup(client, 'abc', name='bob')
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {
+        'detail': 'Idempotency-Key reused with a different request'
+    }
+
+
+def test_fingerprint_is_keyed(client, store):
+    _signup(client, 'abc')
+    ((_, stored_fingerprint, _),) = store._entries.values()
+    body = UserSchemaCreate(
+        name='alice',
+        email='alice@example.com',
+        cpf='52998224725',
+        password='senha',
+    ).model_dump_json()
+
+    assert stored_fingerprint == fingerprint(body)
+    assert stored_fingerprint != hashlib.sha256(body.encode()).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_memory_store_in_progress_and_eviction():
+    clock = FakeClock()
+    store = MemoryIdempotencyStore(ttl=10, max_keys=2, clock=clock)
+
+    assert await store.claim('a', 'fp') is None
+    with pytest.raises(HTTPException) as exc:
+        await store.claim('a', 'fp')
+    assert exc.value.status_code == HTTPStatus.CONFLICT
+
+    await store.complete('a', 'fp', StoredResponse(201, {'id': 1}))
+    assert await store.claim('a', 'fp') == StoredResponse(201, {'id': 1})
+
+    clock.now = 11
+    assert await store.claim('a', 'fp') is None
+
+    await store.claim('b', 'fp')
+    await store.claim('c', 'fp')
+    assert len(store) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_postgres_store_round_trip(session):
+    store = PostgresIdempotencyStore(session, ttl=60)
+
+    assert await store.claim('a', 'fp') is None
+    with pytest.raises(HTTPException):
+        await store.claim('a', 'other')
+
+    await store.complete('a', 'fp', StoredResponse(201, {'id': 1}))
+    assert await store.claim('a', 'fp') == StoredResponse(201, {'id': 1})
+
+    await store.release('a')
+    assert await store.claim('a', 'fp') is None
+
+
+@pytest.mark.asyncio
+async def test_postgres_store_takes_over_expired_keys(session):
+    expired = PostgresIdempotencyStore(session, ttl=-1)
+    await expired.complete('a', 'fp', StoredResponse(201, {'id': 1}))
+
+    store = PostgresIdempotencyStore(session, ttl=60)
+
+    assert await store.claim('a', 'new') is None
+    assert await expired.evict_expired() == 0
+
+
+@pytest.mark.asyncio
+async def test_evictor_deletes_expired_keys_in_batches(session, engine):
+    expired = PostgresIdempotencyStore(session, ttl=-1)
+    for key in 'abcde':
+        await expired.complete(key, 'fp', StoredResponse(201, {'id': 1}))
+    live = PostgresIdempotencyStore(session, ttl=60)
+    await live.complete('f', 'fp', StoredResponse(201, {'id': 2}))
+
+    evictor = IdempotencyKeyEvictor(engine, batch=2)
+
+    assert await evictor.run_once() == 5  # noqa: PLR2004
+    assert await live.claim('f', 'fp') == StoredResponse(201, {'id': 2})
+    assert await evictor.run_once() == 0
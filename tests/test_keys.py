@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from jwt import InvalidTokenError, encode, get_unverified_header
+
+from project.keys import load_keyring
+
+SECRET = 'test-secret'
+
+
+def _write_private(path, key):
+    path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+
+@pytest.fixture
+def keys_dir(tmp_path):
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    _write_private(tmp_path / 'rsa-1.pem', rsa_key)
+    _write_private(tmp_path / 'ed-1.pem', ed25519.Ed25519PrivateKey.generate())
+    (tmp_path / 'old.pem').write_bytes(
+        rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        .public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    ('kid', 'algorithm'), [('rsa-1', 'RS256'), ('ed-1', 'EdDSA')]
+)
+def test_sign_and_verify_with_key_id(keys_dir, kid, algorithm):
+    keyring = load_keyring(SECRET, 'HS256', str(keys_dir), kid)
+
+    token = keyring.sign({'sub': 'alice@example.com'})
+
+    assert get_unverified_header(token) == {
+        'alg': algorithm,
+        'kid': kid,
+        'typ': 'JWT',
+    }
+    assert keyring.verify(token)['sub'] == 'alice@example.com'
+
+
+def test_rotation_keeps_verifying_previous_keys(keys_dir):
+    before = load_keyring(SECRET, 'HS256', str(keys_dir)).sign({'sub': 'a'})
+    after = load_keyring(SECRET, 'HS256', str(keys_dir), 'rsa-1')
+
+    assert after.verify(before)['sub'] == 'a'
+
+
+def test_rejects_unknown_key_and_algorithm_confusion(keys_dir):
+    keyring = load_keyring(SECRET, 'HS256', str(keys_dir), 'rsa-1')
+
+    with pytest.raises(InvalidTokenError):
+        keyring.verify(encode({'sub': 'a'}, SECRET, headers={'kid': 'nope'}))
+    with pytest.raises(InvalidTokenError):
+        keyring.verify(
+            encode(
+                {'sub': 'a'},
+                SECRET,
+                algorithm='HS256',
+                headers={'kid': 'rsa-1'},
+            )
+        )
+    with pytest.raises(ValueError, match='cannot sign'):
+        load_keyring(SECRET, 'HS256', str(keys_dir), 'old')
+
+
+def test_jwks_publishes_only_public_keys(keys_dir):
+    jwks = load_keyring(SECRET, 'HS256', str(keys_dir), 'rsa-1').jwks()
+
+    assert {key['kid']: key['alg'] for key in jwks['keys']} == {
+        'ed-1': 'EdDSA',
+        'old': 'RS256',
+        'rsa-1': 'RS256',
+    }
+    assert all('d' not in key for key in jwks['keys'])
+
+
+def test_jwks_endpoint(client):
+    response = client.get('/.well-known/jwks.json')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'keys': []}
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
@@ -0,0 +1,156 @@
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import select
+
+from project.models.base import Order, Product
+
+
+def _order(client, token, *items):
+    return client.post(
+        '/orders/',
+        json={
+            'items': [
+                {'product_id': product_id, 'quantity': quantity}
+                for product_id, quantity in items
+            ]
+        },
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+
+async def _stock(session, product_id):
+    session.expire_all()
+    return await session.scalar(
+        select(Product.stock).where(Product.id == product_id)
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_order_reserves_stock(client, session, token, product):
+    product_id, stock = product.id, product.stock
+
+    response = _order(client, token, (product_id, 2), (product_id, 1))
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json()['status'] == 'pending'
+    assert response.json()['total'] == 30.0  # noqa: PLR2004
+    assert await _stock(session, product_id) == stock - 3
+
+
+def test_create_order_locks_products_first(
+    client, token, product, sql_statements
+):
+    with sql_statements() as recorded:
+        _order(client, token, (product.id, 1))
+
+    locks = [
+        index
+        for index, statement in enumerate(recorded.sql)
+        if statement.startswith('SELECT products.id')
+        and 'FOR UPDATE' in statement
+    ]
+    updates = [
+        index
+        for index, statement in enumerate(recorded.sql)
+        if statement.startswith('UPDATE products')
+    ]
+    assert locks
+    assert 'ORDER BY products.id' in recorded.sql[locks[0]]
+    assert locks[0] < updates[0]
+
+
+@pytest.mark.asyncio
+async def test_create_order_insufficient_stock(
+    client, session, token, product
+):
+    product_id, stock = product.id, product.stock
+
+    response = _order(client, token, (product_id, stock + 1))
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Insufficient stock'}
+    assert await _stock(session, product_id) == stock
+    assert await session.scalar(select(Order.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_order_restocks(client, session, token, product):
+    product_id, stock = product.id, product.stock
+    order_id = _order(client, token, (product_id, 4)).json()['id']
+
+    response = client.post(
+        f'/orders/{order_id}/cancel',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['status'] == 'canceled'
+    assert await _stock(session, product_id) == stock
+
+
+def test_order_transitions_only_from_pending(
+    client, token, admin_token, product
+):
+    order_id = _order(client, token, (product.id, 1)).json()['id']
+    admin = {'Authorization': f'Bearer {admin_token}'}
+
+    response = client.post(f'/orders/{order_id}/complete', headers=admin)
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['status'] == 'completed'
+
+    response = client.post(f'/orders/{order_id}/cancel', headers=admin)
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Order is already completed'}
+
+
+def test_clients_cancel_only_their_orders(client, token, other_user, product):
+    order_id = _order(client, token, (product.id, 1)).json()['id']
+    other_token = client.post(
+        '/auth/token',
+        data={
+            'username': other_user.email,
+            'password': other_user.clean_password,
+        },
+    ).json()['access_token']
+
+    response = client.post(
+        f'/orders/{order_id}/cancel',
+        headers={'Authorization': f'Bearer {other_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Order not found'}
+
+
+def test_complete_requires_admin(client, token, product):
+    order_id = _order(client, token, (product.id, 1)).json()['id']
+
+    response = client.post(
+        f'/orders/{order_id}/complete',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_pending_orders_queue(client, token, admin_token, product):
+    ids = [_order(client, token, (product.id, 1)).json()['id'] for _ in '123']
+    admin = {'Authorization': f'Bearer {admin_token}'}
+    client.post(f'/orders/{ids[0]}/complete', headers=admin)
+
+    first = client.get(
+        '/orders/pending', params={'limit': 1}, headers=admin
+    ).json()['orders']
+    assert [order['id'] for order in first] == [ids[1]]
+
+    second = client.get(
+        '/orders/pending',
+        params={
+            'limit': 1,
+            'after_created': first[0]['created_at'],
+            'after_id': first[0]['id'],
+        },
+        headers=admin,
+    ).json()['orders']
+    assert [order['id'] for order in second] == [ids[2]]
@@ -0,0 +1,123 @@
+from datetime import date, datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from validate_docbr import CPF
+
+from project.commands.partitions import (
+    add_months,
+    convert_orders,
+    detach_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    revert_orders,
+)
+from project.models.base import Client, Order
+
+TODAY = date(2025, 6, 15)
+
+
+async def _run(session, fn, *args, **kwargs):
+    conn = await session.connection()
+    return await conn.run_sync(fn, *args, **kwargs)
+
+
+async def _pending_index(session):
+    return await session.scalar(
+        text(
+            'SELECT indexdef FROM pg_indexes '
+            "WHERE tablename = 'orders' AND indexname = 'ix_orders_pending'"
+        )
+    )
+
+
+@pytest_asyncio.fixture
+async def partitioned(session):
+    client = Client(
+        name='alice',
+        email='alice@teste.com',
+        cpf=CPF().generate(),
+        password='hash',
+    )
+    session.add(client)
+    await session.flush()
+
+    for created_at in (datetime(2024, 1, 10), datetime(2025, 6, 1)):
+        order = Order(client_id=client.id, client=client, products=[])
+        session.add(order)
+        await session.flush()
+        order.created_at = created_at
+    await session.commit()
+
+    await _run(session, convert_orders)
+    await session.commit()
+
+    yield session
+
+    await session.rollback()
+
+
+def test_add_months():
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+
+@pytest.mark.asyncio
+async def test_convert_orders_keeps_rows(partitioned):
+    assert await _run(partitioned, is_partitioned)
+
+    rows = await partitioned.execute(
+        text('SELECT tableoid::regclass::text, id FROM orders ORDER BY id')
+    )
+    assert rows.all() == [('orders_p2024_01', 1), ('orders_p2025_06', 2)]
+    assert "WHERE (status = 'PENDING'" in await _pending_index(partitioned)
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_future_months(partitioned):
+    created = await _run(
+        partitioned, ensure_partitions, 2, today=date(2030, 1, 1)
+    )
+
+    assert created == ['orders_p2030_01', 'orders_p2030_02', 'orders_p2030_03']
+    assert 'orders_p2030_03' in await _run(partitioned, list_partitions)
+
+
+@pytest.mark.asyncio
+async def test_detach_partitions_older_than_retention(partitioned):
+    dry_run = await _run(
+        partitioned, detach_partitions, 12, today=TODAY, dry_run=True
+    )
+    detached = await _run(partitioned, detach_partitions, 12, today=TODAY)
+
+    assert dry_run == detached
+    assert detached[0] == 'orders_p2024_01'
+    assert 'orders_p2024_06' not in detached
+    assert 'orders_p2024_01' not in await _run(partitioned, list_partitions)
+
+
+@pytest.mark.asyncio
+async def test_recent_orders_prune_partitions(partitioned):
+    plan = await partitioned.scalars(
+        text(
+            'EXPLAIN SELECT id FROM orders '
+            "WHERE created_at >= '2025-06-01' AND created_at < '2025-07-01'"
+        )
+    )
+    plan = '\n'.join(plan.all())
+
+    assert 'orders_p2025_06' in plan
+    assert 'orders_p2024_01' not in plan
+    assert 'orders_default' not in plan
+
+
+@pytest.mark.asyncio
+async def test_revert_orders(partitioned):
+    await _run(partitioned, revert_orders)
+
+    assert not await _run(partitioned, is_partitioned)
+    count = await partitioned.scalar(text('SELECT count(*) FROM orders'))
+    assert count == 2  # noqa: PLR2004
+    assert "WHERE (status = 'PENDING'" in await _pending_index(partitioned)
@@ -0,0 +1,375 @@
+import json
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+
+from project.models.base import Product, Section
+from project.routers import products
+
+
+def test_list_products(client, product):
+    response = client.get('/products/')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['products'][0]['name'] == product.name
+    assert response.headers['etag'].startswith('W/"')
+    assert response.headers['cache-control'] == 'public, max-age=60'
+    assert 'last-modified' in response.headers
+
+
+@pytest.mark.asyncio
+async def test_list_products_by_section(client, session, product):
+    session.add(
+        Product(
+            name='camisa',
+            description='camisa de algodão',
+            price=50.0,
+            barcode='000000000999',
+            section=Section.VESTUARIO,
+            stock=3,
+            expiration_date=datetime(2030, 1, 1),
+        )
+    )
+    await session.commit()
+
+    response = client.get('/products/', params={'section': 'vestuario'})
+
+    products = response.json()['products']
+    assert [p['section'] for p in products] == ['vestuario']
+
+
+def test_get_product_not_modified(client, product):
+    first = client.get(f'/products/{product.id}')
+
+    response = client.get(
+        f'/products/{product.id}',
+        headers={'If-None-Match': first.headers['etag']},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+    assert response.headers['etag'] == first.headers['etag']
+
+
+@pytest.mark.asyncio
+async def test_get_product_modified_after_update(client, session, product):
+    etag = client.get(f'/products/{product.id}').headers['etag']
+
+    product.stock = 5
+    product.update()
+    await session.commit()
+
+    response = client.get(
+        f'/products/{product.id}', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['stock'] == 5  # noqa: PLR2004
+    assert response.headers['etag'] != etag
+
+
+def test_get_product_if_modified_since(client, product):
+    last_modified = client.get(f'/products/{product.id}').headers[
+        'last-modified'
+    ]
+
+    response = client.get(
+        f'/products/{product.id}',
+        headers={'If-Modified-Since': last_modified},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    response = client.get(
+        f'/products/{product.id}',
+        headers={'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_get_product_not_found(client):
+    response = client.get('/products/999')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Product not found'}
+
+
+def test_cache_control_is_configurable(client, product, monkeypatch):
+    monkeypatch.setattr(
+        'project.http_cache.settings.CACHE_CONTROL',
+        {'/products/{product_id}': 'no-store'},
+    )
+
+    response = client.get(f'/products/{product.id}')
+
+    assert response.headers['cache-control'] == 'no-store'
+
+
+PRODUCT = {
+    'name': 'sabonete',
+    'description': 'sabonete neutro',
+    'price': 3.5,
+    'barcode': '000000000123',
+    'section': 'higiene',
+    'stock': 4,
+    'expiration_date': '2030-01-01T00:00:00',
+}
+
+
+@pytest.mark.asyncio
+async def test_listing_is_cached_until_a_write(
+    client, session, admin_token, product
+):
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    client.get('/products/')
+
+    product.name = 'changed behind the cache'
+    await session.commit()
+    cached = client.get('/products/').json()['products']
+    assert [p['name'] for p in cached] != ['changed behind the cache']
+
+    response = client.post('/products/', json=PRODUCT, headers=headers)
+    assert response.status_code == HTTPStatus.CREATED
+
+    names = [p['name'] for p in client.get('/products/').json()['products']]
+    assert names == ['changed behind the cache', 'sabonete']
+
+
+def test_write_invalidates_only_affected_sections(client, admin_token):
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    created = client.post('/products/', json=PRODUCT, headers=headers).json()
+    before = client.get('/products/', params={'section': 'vestuario'})
+    client.get('/products/', params={'section': 'higiene'})
+
+    client.patch(
+        f'/products/{created["id"]}/stock',
+        json={'delta': -1},
+        headers=headers,
+    )
+
+    after = client.get(
+        '/products/',
+        params={'section': 'vestuario'},
+        headers={'If-None-Match': before.headers['etag']},
+    )
+    assert after.status_code == HTTPStatus.NOT_MODIFIED
+    higiene = client.get('/products/', params={'section': 'higiene'}).json()
+    assert higiene['products'][0]['stock'] == 3  # noqa: PLR2004
+
+
+def test_change_stock_insufficient(client, admin_token, product):
+    response = client.patch(
+        f'/products/{product.id}/stock',
+        json={'delta': -(product.stock + 1)},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Insufficient stock'}
+
+
+@pytest.mark.asyncio
+async def test_change_stock_batch(client, session, admin_token, product):
+    twins = [
+        Product(
+            name=f'sabonete{index}',
+            description='sabonete',
+            price=2.0,
+            barcode='777000000000',
+            section=Section.HIGIENE,
+            stock=5,
+            expiration_date=datetime.now() + timedelta(days=90),
+        )
+        for index in range(2)
+    ]
+    session.add_all(twins)
+    await session.commit()
+    product_id, barcode, stock = product.id, product.barcode, product.stock
+    first, second = twins[0].id, twins[1].id
+
+    response = client.patch(
+        '/products/stock',
+        json={
+            'items': [
+                {'barcode': barcode, 'delta': 4},
+                {'id': product_id, 'stock': 0},
+                {'id': first, 'delta': -6},
+                {'id': second, 'stock': 9},
+                {'barcode': '777000000000', 'delta': 1},
+                {'id': 999_999, 'delta': 1},
+            ]
+        },
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'updated': [
+            {'index': 0, 'id': product_id, 'stock': stock + 4},
+            {'index': 3, 'id': second, 'stock': 9},
+        ],
+        'failed': [
+            {'index': 1, 'detail': 'Duplicate product in batch'},
+            {'index': 2, 'detail': 'Insufficient stock'},
+            {'index': 4, 'detail': 'Ambiguous barcode'},
+            {'index': 5, 'detail': 'Product not found'},
+        ],
+    }
+
+
+@pytest.mark.asyncio
+async def test_adjust_stock_in_chunks(session, product):
+    from project.schemas.products import StockAdjustment  # noqa: PLC0415
+    from project.stock import adjust_stock  # noqa: PLC0415
+
+    stock = product.stock
+    outcome = await adjust_stock(
+        session,
+        [
+            StockAdjustment(id=product.id, delta=1),
+            StockAdjustment(id=product.id + 1, delta=1),
+            StockAdjustment(id=product.id + 2, stock=1),
+        ],
+        chunk_size=1,
+    )
+
+    assert outcome.updated == [
+        {'index': 0, 'id': product.id, 'stock': stock + 1}
+    ]
+    assert [row['index'] for row in outcome.failed] == [1, 2]
+    assert outcome.sections == {product.section}
+
+
+@pytest.mark.asyncio
+async def test_adjust_stock_locks_chunks_in_id_order(
+    session, product, monkeypatch
+):
+    from project import stock  # noqa: PLC0415
+    from project.schemas.products import StockAdjustment  # noqa: PLC0415
+
+    locked = []
+    original = stock._lock_products
+
+    async def recording_lock(session, ids):
+        locked.append(ids)
+        await original(session, ids)
+
+    monkeypatch.setattr(stock, '_lock_products', recording_lock)
+    await stock.adjust_stock(
+        session,
+        [
+            StockAdjustment(id=product.id + 2, delta=1),
+            StockAdjustment(id=product.id, delta=1),
+            StockAdjustment(id=product.id + 1, delta=1),
+        ],
+        chunk_size=2,
+    )
+
+    assert locked == [[product.id, product.id + 1], [product.id + 2]]
+
+
+def test_change_stock_batch_validates_items(client, admin_token):
+    response = client.patch(
+        '/products/stock',
+        json={'items': [{'id': 1, 'barcode': '1', 'delta': 1}]},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_update_and_delete_product(client, admin_token, product):
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    client.get('/products/')
+
+    response = client.put(
+        f'/products/{product.id}',
+        json={**PRODUCT, 'section': 'vestuario'},
+        headers=headers,
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['section'] == 'vestuario'
+
+    response = client.delete(f'/products/{product.id}', headers=headers)
+    assert response.json() == {'message': 'Product deleted'}
+    assert client.get('/products/').json() == {'products': []}
+
+
+def test_client_cannot_write_products(client, token):
+    response = client.post(
+        '/products/',
+        json=PRODUCT,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Not enough permissions'}
+
+
+@pytest.mark.asyncio
+async def test_expiring_report_pages_by_keyset(
+    client, session, admin_token, monkeypatch
+):
+    # Several fetches from the server-side cursor per page.
+    monkeypatch.setattr(products, 'REPORT_FETCH_SIZE', 1)
+    soon = datetime.now()
+    for index, days in enumerate([1, 2, 3, 30]):
+        session.add(
+            Product(
+                name=f'leite{index}',
+                description='leite',
+                price=5.0,
+                barcode=f'{index:012d}',
+                section=Section.ALIMENTACAO,
+                stock=10,
+                expiration_date=soon + timedelta(days=days),
+            )
+        )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {admin_token}'}
+
+    response = client.get(
+        '/products/reports/expiring',
+        params={'days': 7, 'limit': 2},
+        headers=headers,
+    )
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    first = [json.loads(line) for line in response.text.splitlines()]
+    assert [p['name'] for p in first] == ['leite0', 'leite1']
+
+    response = client.get(
+        '/products/reports/expiring',
+        params={
+            'days': 7,
+            'limit': 2,
+            'after_expiration': first[-1]['expiration_date'],
+            'after_id': first[-1]['id'],
+        },
+        headers=headers,
+    )
+    second = [json.loads(line) for line in response.text.splitlines()]
+    assert [p['name'] for p in second] == ['leite2']
+
+
+@pytest.mark.asyncio
+async def test_low_stock_report(client, session, admin_token, product):
+    product.stock = 1
+    await session.commit()
+
+    response = client.get(
+        '/products/reports/low-stock',
+        params={'threshold': 2, 'section': product.section.value},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(p['id'], p['stock']) for p in rows] == [(product.id, 1)]
+
+
+def test_reports_require_admin(client, token):
+    response = client.get(
+        '/products/reports/low-stock',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
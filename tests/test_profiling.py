@@ -0,0 +1,61 @@
+import threading
+import time
+from http import HTTPStatus
+
+from project.profiler import Sampler
+
+
+def _spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_cpu_sampler_sees_busy_thread():
+    busy = threading.Thread(target=_spin, args=(0.2,))
+    sampler = Sampler('cpu', interval=0.005)
+    sampler.start()
+    busy.start()
+    busy.join()
+    profile = sampler.stop()
+
+    assert profile.samples > 0
+    assert '_spin (test_profiling.py:' in profile.collapsed()
+
+
+def test_profile_requires_admin(client, token):
+    response = client.get(
+        '/admin/profile',
+        params={'seconds': 0.05},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Not enough permissions'}
+
+
+def test_cpu_profile_collapsed(client, admin_token):
+    response = client.get(
+        '/admin/profile',
+        params={'seconds': 0.1},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+
+
+def test_wall_profile_speedscope(client, admin_token):
+    response = client.get(
+        '/admin/profile',
+        params={'seconds': 0.3, 'mode': 'wall', 'format': 'speedscope'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+    body = response.json()
+    names = {frame['name'] for frame in body['shared']['frames']}
+
+    assert response.status_code == HTTPStatus.OK
+    assert body['profiles'][0]['type'] == 'sampled'
+    # The loop lag monitor task is always parked in its sleep.
+    assert '_run' in names
+    assert 'profile' not in names
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text, update
+
+from project.models.base import Order, OrderStatus, Product
+from project.reaper import OrderReaper, reap_stale_orders
+
+
+def _place_orders(client, token, product_id, count):
+    return [
+        client.post(
+            '/orders/',
+            json={'items': [{'product_id': product_id, 'quantity': 2}]},
+            headers={'Authorization': f'Bearer {token}'},
+        ).json()['id']
+        for _ in range(count)
+    ]
+
+
+async def _backdate(session, ids, minutes):
+    await session.execute(
+        update(Order)
+        .where(Order.id.in_(ids))
+        .values(created_at=datetime.now() - timedelta(minutes=minutes))
+    )
+    await session.commit()
+
+
+async def _statuses(session):
+    session.expire_all()
+    rows = await session.execute(select(Order.id, Order.status))
+    return dict(rows.all())
+
+
+@pytest.mark.asyncio
+async def test_reaper_cancels_stale_orders_in_batches(
+    client, session, token, product
+):
+    product_id, stock = product.id, product.stock
+    stale = _place_orders(client, token, product_id, 3)
+    fresh = _place_orders(client, token, product_id, 1)
+    await _backdate(session, stale, minutes=60)
+
+    report = await reap_stale_orders(session, ttl_minutes=30, batch_size=2)
+
+    assert (report.batches, report.orders, report.units) == (2, 3, 6)
+    statuses = await _statuses(session)
+    assert {statuses[order_id] for order_id in stale} == {OrderStatus.CANCELED}
+    assert statuses[fresh[0]] == OrderStatus.PENDING
+    assert await session.scalar(
+        select(Product.stock).where(Product.id == product_id)
+    ) == (stock - 2)
+
+
+@pytest.mark.asyncio
+async def test_reaper_skips_locked_orders(
+    client, session, engine, token, product
+):
+    stale = _place_orders(client, token, product.id, 2)
+    await _backdate(session, stale, minutes=60)
+
+    async with engine.connect() as other:
+        await other.execute(
+            text('SELECT id FROM orders WHERE id = :id FOR UPDATE'),
+            {'id': stale[0]},
+        )
+        report = await reap_stale_orders(session, ttl_minutes=30)
+        await other.rollback()
+
+    assert report.orders == 1
+    statuses = await _statuses(session)
+    assert statuses[stale[0]] == OrderStatus.PENDING
+    assert statuses[stale[1]] == OrderStatus.CANCELED
+
+
+@pytest.mark.asyncio
+async def test_reaper_metrics(client, session, engine, token, product):
+    stale = _place_orders(client, token, product.id, 1)
+    await _backdate(session, stale, minutes=60)
+    reaper = OrderReaper(engine, ttl_minutes=30)
+    client.app.state.order_reaper = reaper
+
+    await reaper.run_once()
+
+    metrics = client.get('/metrics').text
+    assert 'order_reaper_runs_total 1' in metrics
+    assert 'order_reaper_orders_canceled_total 1' in metrics
+    assert 'order_reaper_units_restocked_total 2' in metrics
@@ -0,0 +1,97 @@
+import time
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from project import database
+from project.database import PRIMARY_STICKY_COOKIE, get_read_db
+from project.middleware import ReadYourWritesMiddleware
+
+
+def _request(cookie=None):
+    headers = []
+    if cookie is not None:
+        headers.append((
+            b'cookie',
+            f'{PRIMARY_STICKY_COOKIE}={cookie}'.encode(),
+        ))
+
+    return Request({'type': 'http', 'headers': headers})
+
+
+def _session_factory(name):
+    @asynccontextmanager
+    async def factory():
+        class FakeSession:
+            async def close(self):
+                pass
+
+        session = FakeSession()
+        session.name = name
+        yield session
+
+    return factory
+
+
+@pytest.fixture
+def sticky_app():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, stickiness=5)
+
+    @app.get('/items')
+    def read_items():
+        return {}
+
+    @app.post('/items')
+    def write_item():
+        return {}
+
+    @app.post('/fail')
+    def fail():
+        raise HTTPException(status_code=HTTPStatus.CONFLICT)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ('cookie', 'expected'),
+    [
+        (None, False),
+        ('garbage', False),
+        (str(time.time() - 1), False),
+        (str(time.time() + 3600), True),
+    ],
+)
+def test_wants_primary(cookie, expected):
+    assert database.wants_primary(_request(cookie)) is expected
+
+
+@pytest.mark.asyncio
+async def test_get_read_db_routes_by_stickiness(monkeypatch):
+    monkeypatch.setitem(database._engines, 'primary', None)
+    monkeypatch.setattr(database, 'SessionLocal', _session_factory('primary'))
+    monkeypatch.setattr(
+        database, 'ReplicaSessionLocal', _session_factory('replica')
+    )
+
+    fresh = get_read_db(_request())
+    sticky = get_read_db(_request(str(time.time() + 60)))
+
+    assert (await fresh.__anext__()).name == 'replica'
+    assert (await sticky.__anext__()).name == 'primary'
+
+
+def test_write_sets_sticky_cookie(sticky_app):
+    response = sticky_app.post('/items')
+
+    assert response.status_code == HTTPStatus.OK
+    until = float(response.cookies[PRIMARY_STICKY_COOKIE])
+    assert time.time() < until <= time.time() + 5
+
+
+def test_read_and_failed_write_do_not_set_cookie(sticky_app):
+    assert PRIMARY_STICKY_COOKIE not in sticky_app.get('/items').cookies
+    assert PRIMARY_STICKY_COOKIE not in sticky_app.post('/fail').cookies
@@ -0,0 +1,78 @@
+import pytest
+
+from project.http_cache import RenderedResponse
+from project.response_cache import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+)
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the cache uses; no expiry."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_by_size():
+    backend = MemoryCacheBackend(max_bytes=10)
+    await backend.set('a', b'1234', ttl=60)
+    await backend.set('b', b'1234', ttl=60)
+    await backend.get('a')
+
+    await backend.set('c', b'1234', ttl=60)
+
+    assert await backend.get('b') is None
+    assert await backend.get('a') == b'1234'
+    assert backend.size == 8  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries():
+    now = [0.0]
+    backend = MemoryCacheBackend(max_bytes=10, clock=lambda: now[0])
+    await backend.set('a', b'1', ttl=5)
+
+    now[0] = 5.0
+
+    assert await backend.get('a') is None
+    assert backend.size == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'backend', [MemoryCacheBackend, lambda: RedisCacheBackend(FakeRedis())]
+)
+async def test_invalidation_changes_the_key(backend):
+    cache = ResponseCache(backend())
+    rendered = RenderedResponse(b'{"products":[]}', 'W/"x"', None)
+    key = await cache.key(['products:higiene'], {'limit': 10, 'offset': 0})
+    await cache.set(key, rendered)
+
+    assert await cache.get(key) == rendered
+    assert (
+        await cache.key(['products:higiene'], {'offset': 0, 'limit': 10})
+        == key
+    )
+
+    await cache.invalidate(['products:higiene'])
+
+    assert (
+        await cache.key(['products:higiene'], {'limit': 10, 'offset': 0})
+        != key
+    )
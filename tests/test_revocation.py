@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from project.models.base import TokenRevocation
+from project.revocation import RevocationList
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_new_revocations(session):
+    revocations = RevocationList(interval=60)
+    await revocations.refresh(session)
+    assert not revocations.due
+
+    session.add(
+        TokenRevocation(
+            jti='a' * 32, expires_at=datetime.now() + timedelta(minutes=5)
+        )
+    )
+    await session.commit()
+    assert 'a' * 32 not in revocations
+
+    await revocations.refresh(session)
+
+    assert 'a' * 32 in revocations
+
+
+@pytest.mark.asyncio
+async def test_refresh_drops_expired_revocations(session):
+    revocations = RevocationList(interval=60)
+    revocations.add('b' * 32, datetime.now() - timedelta(seconds=1))
+    session.add(
+        TokenRevocation(
+            jti='c' * 32, expires_at=datetime.now() - timedelta(seconds=1)
+        )
+    )
+    await session.commit()
+
+    await revocations.refresh(session)
+
+    assert len(revocations) == 0
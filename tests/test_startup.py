@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+
+from project import database
+from project.commands.startup_profile import parse_importtime
+from project.main import create_app
+
+
+def test_import_does_not_create_engines():
+    probe = (
+        'import project.main, project.database as db;'
+        'assert not db._engines, db._engines'
+    )
+
+    subprocess.run([sys.executable, '-c', probe], check=True)
+
+
+def test_lifespan_creates_and_disposes_engines(monkeypatch, engine, session):
+    url = engine.url.render_as_string(hide_password=False)
+    monkeypatch.setattr(database.settings, 'DB_URL', url)
+
+    with TestClient(create_app()):
+        created = database.get_engine()
+        assert created is not engine
+        assert database.SessionLocal.kw['bind'] is created
+        assert created.pool.checkedin() >= 2  # noqa: PLR2004
+
+    assert not database._engines
+
+
+def test_readiness_reflects_warm_up(engine, session):
+    app = create_app(engine=engine)
+    cold = TestClient(app).get('/health/ready')
+
+    with TestClient(app) as client:
+        warm = client.get('/health/ready')
+
+    assert cold.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert cold.json() == {'detail': 'Warming up'}
+    assert warm.status_code == HTTPStatus.OK
+    assert warm.json()['status'] == 'ready'
+    assert not app.state.ready
+
+
+def test_lifespan_runs_idempotency_evictor_with_postgres_backend(
+    monkeypatch, engine, session
+):
+    monkeypatch.setattr(database.settings, 'IDEMPOTENCY_BACKEND', 'postgres')
+    app = create_app(engine=engine)
+
+    with TestClient(app):
+        evictor = app.state.idempotency_evictor
+        assert evictor._task is not None
+
+    assert evictor._task is None
+
+
+def test_parse_importtime():
+    lines = [
+        'import time: self [us] | cumulative | imported package',
+        'import time:       120 |        120 |   project.config',
+        'import time:      1500 |       1620 | project.main',
+        'unrelated output',
+    ]
+
+    costs = parse_importtime(lines)
+
+    assert [
+        (c.module, c.self_us, c.cumulative_us, c.depth) for c in costs
+    ] == [
+        ('project.config', 120, 120, 1),
+        ('project.main', 1500, 1620, 0),
+    ]
@@ -41,6 +41,58 @@ def test_create_client(client):
     }
 
 
+def test_create_client_statement_budget(client, sql_statements):
+    with sql_statements() as recorded:
+        response = client.post(
+            '/client/',
+            json={
+                'name': 'alice',
+                'email': 'alice@example.com',
+                'cpf': CPF().generate(),
+                'password': 'senha',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert recorded.count <= 1, recorded.sql
+
+
+def test_create_client_with_admin_email(client, admin):
+    response = client.post(
+        '/client/',
+        json={
+            'name': 'alice',
+            'email': admin.email,
+            'cpf': CPF().generate(),
+            'password': 'senha',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'Email already exists'}
+
+
+def test_created_client_is_listed(client, admin_token):
+    cpf = CPF().generate()
+    client.post(
+        '/client/',
+        json={
+            'name': 'alice',
+            'email': 'alice@example.com',
+            'cpf': cpf,
+            'password': 'senha',
+        },
+    )
+
+    response = client.get(
+        '/admin/',
+        params={'email': 'alice@example.com'},
+        headers={'Authorization': f'Bearer {admin_token}'},
+    )
+
+    assert [user['cpf'] for user in response.json()['users']] == [cpf]
+
+
 def test_create_client_invalid_cpf(client):
     password = 'senha'
     response = client.post(
@@ -53,8 +105,29 @@ def test_create_client_invalid_cpf(client):
         },
     )
 
-    assert response.status_code == HTTPStatus.BAD_REQUEST
-    assert response.json() == {'detail': 'Invalid CPF'}
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json()['detail'][0]['loc'] == ['body', 'cpf']
+    assert response.json()['detail'][0]['msg'] == 'Invalid CPF'
+
+
+def test_create_client_normalizes_cpf(client):
+    cpf = CPF().generate()
+    payload = {
+        'name': 'alice',
+        'email': 'alice@example.com',
+        'cpf': CPF().mask(cpf),
+        'password': 'senha',
+    }
+    created = client.post('/client/', json=payload)
+    duplicate = client.post(
+        '/client/',
+        json={**payload, 'email': 'bob@example.com', 'cpf': cpf},
+    )
+
+    assert created.status_code == HTTPStatus.CREATED
+    assert created.json()['cpf'] == cpf
+    assert duplicate.status_code == HTTPStatus.CONFLICT
+    assert duplicate.json() == {'detail': 'CPF already exists'}
 
 
 def test_create_client_with_existing_email(client):
@@ -225,3 +298,28 @@ async def test_delete_client_with_wrong_user(
 
     assert forbidden_user.is_deleted is False
     assert forbidden_user.deleted_at is None
+
+
+def test_get_client_not_modified(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = client.get(f'/client/{user.id}', headers=headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['email'] == user.email
+    assert response.headers['cache-control'] == 'private, no-cache'
+
+    response = client.get(
+        f'/client/{user.id}',
+        headers={**headers, 'If-None-Match': response.headers['etag']},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_other_client_forbidden(client, other_user, token):
+    response = client.get(
+        f'/client/{other_user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN